@@ -1,6 +1,7 @@
 import asyncio
 import hmac
 import base64
+import os
 
 
 from contextlib import asynccontextmanager
@@ -8,11 +9,12 @@ from pathlib import Path
 from datetime import datetime, UTC
 
 
+import orjson
 import uvicorn
 
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
 
@@ -25,24 +27,63 @@ DATA_FILE = STATIC_DIR / "data.txt"
 DUMMY_API_KEY = "abc"
 DUMMY_API_SECRET = "def"
 
+# Pre-encoded signing inputs. hmac.digest() hands these straight to OpenSSL's
+# one-shot HMAC, skipping the Python-level HMAC object entirely.
+_SECRET_BYTES = DUMMY_API_SECRET.encode('utf-8')
+_VERIFY_SUFFIX = b'GET/users/self/verify'
+
+# Only the timestamp in a stream frame changes, so the JSON around it is fixed.
+# An ISO-8601 timestamp never needs escaping, which makes splicing it in safe.
+_STREAM_PREFIX = '{"timestamp":"'
+_STREAM_SUFFIX = '","message":"This is a periodic update from the server."}'
+
+# The login replies never change, so encode them once with orjson.
+_LOGIN_SUCCESS = orjson.dumps({"event": "login", "success": True}).decode()
+_LOGIN_FAILURE = orjson.dumps({"event": "login", "success": False, "message": "Authentication failed"}).decode()
+
+# The health-check bodies are constant, so skip the per-request JSON encoding.
+_ROOT_JSON = b'{"message":"Server is running"}'
+_STATUS_JSON = b'{"status":"ok"}'
+
+_ECHO_PREFIX = "Echo: "
+_ECHO_PREFIX_BYTES = b"Echo: "
+
 
 class CreateItemRequest(BaseModel):
     name: str
     is_offer: bool | None = None
 
 
+def create_data_file():
+    """Writes the static file served by /static/data.txt."""
+    STATIC_DIR.mkdir(exist_ok=True)
+    DATA_FILE.write_text("This is a test file served by FastAPI.")
+
+
+def remove_data_file():
+    """Removes the static file and its directory again."""
+    DATA_FILE.unlink()
+    STATIC_DIR.rmdir()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Manages the creation and cleanup of a static file for demonstration.
+    When started through `__main__` the parent process has already created
+    the file for all workers, so a worker only creates and removes it when
+    it is running on its own (e.g., under TestClient).
     """
     print("Server is starting up...")
-    STATIC_DIR.mkdir(exist_ok=True)
-    DATA_FILE.write_text("This is a test file served by FastAPI.")
+    owns_data_file = not DATA_FILE.is_file()
+    if owns_data_file:
+        create_data_file()
+    # The file is immutable once written, so stat it once for FileResponse.
+    app.state.data_file_stat = DATA_FILE.stat()
     yield
     print("Server is shutting down...")
-    DATA_FILE.unlink()
-    STATIC_DIR.rmdir()
+    if owns_data_file:
+        remove_data_file()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -63,36 +104,40 @@ def _verify_signature(payload: dict) -> bool:
     if api_key != DUMMY_API_KEY:
         return False
 
+    # Decode the client's signature once rather than base64-encoding ours
+    try:
+        client_digest = base64.b64decode(client_sign, validate=True)
+    except (ValueError, TypeError):
+        return False
+
+    # Timestamps arrive as ASCII digit strings; reject anything else up front
+    if not isinstance(timestamp, str) or not (timestamp.isascii() and timestamp.isdigit()):
+        return False
+
     # Re-create the signature on the server side
-    message = str(timestamp) + 'GET' + '/users/self/verify'
-    mac = hmac.new(
-        bytes(DUMMY_API_SECRET, encoding='utf8'),
-        bytes(message, encoding='utf-8'),
-        digestmod='sha256'
-    )
-    server_sign = base64.b64encode(mac.digest()).decode()
+    digest = hmac.digest(_SECRET_BYTES, timestamp.encode('ascii') + _VERIFY_SUFFIX, 'sha256')
 
-    # Securely compare the client's signature with the server's
-    return hmac.compare_digest(server_sign, client_sign)
+    # Securely compare the raw digests
+    return hmac.compare_digest(digest, client_digest)
 
 
 
-@app.get("/")
+@app.get("/", response_class=Response)
 async def read_root():
     """A simple root endpoint to confirm the server is running."""
-    return {"message": "Server is running"}
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
-@app.get("/status")
+@app.get("/status", response_class=Response)
 async def get_status():
     """Returns the current status of the server."""
-    return {"status": "ok"}
+    return Response(content=_STATUS_JSON, media_type="application/json")
 
 
 @app.get("/static/data.txt")
 async def get_data_file():
     """Serves the static data.txt file."""
-    return FileResponse(DATA_FILE)
+    return FileResponse(DATA_FILE, stat_result=app.state.data_file_stat)
 
 
 @app.get("/items/{item_id}")
@@ -122,8 +167,15 @@ async def websocket_echo(websocket: WebSocket):
     await websocket.accept()
     try:
         while True:
-            message = await websocket.receive_text()
-            await websocket.send_text(f"Echo: {message}")
+            # Work on the raw ASGI message so binary frames are echoed as bytes
+            # without a UTF-8 round trip, while text frames still echo as text.
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                await websocket.send_bytes(_ECHO_PREFIX_BYTES + message["bytes"])
+            else:
+                await websocket.send_text(_ECHO_PREFIX + message["text"])
     except WebSocketDisconnect:
         print("Client disconnected from echo endpoint.")
 
@@ -136,13 +188,8 @@ async def websocket_stream(websocket: WebSocket):
     await websocket.accept()
     try:
         while True:
-            # Generate the data to send
-            payload = {
-                "timestamp": datetime.now(UTC).isoformat(),
-                "message": "This is a periodic update from the server."
-            }
-            # Send the data as JSON
-            await websocket.send_json(payload)
+            # Splice the current time into the pre-built JSON frame
+            await websocket.send_text(_STREAM_PREFIX + datetime.now(UTC).isoformat() + _STREAM_SUFFIX)
             # Wait for one second
             await asyncio.sleep(1)
     except WebSocketDisconnect:
@@ -156,11 +203,15 @@ async def websocket_private(websocket: WebSocket):
     """
     await websocket.accept()
     try:
-        # Wait for the initial login message
-        login_payload = await websocket.receive_json()
+        # Wait for the initial login message and parse it with orjson
+        try:
+            login_payload = orjson.loads(await websocket.receive_text())
+        except orjson.JSONDecodeError:
+            await websocket.close()
+            return
 
         if login_payload.get("op") == "login" and _verify_signature(login_payload):
-            await websocket.send_json({"event": "login", "success": True})
+            await websocket.send_text(_LOGIN_SUCCESS)
             # --- AUTHENTICATED LOOP ---
             # The client is now authenticated.
             # You could enter another loop here to handle private data.
@@ -168,7 +219,7 @@ async def websocket_private(websocket: WebSocket):
             await websocket.close()
         else:
             # If login fails, send an error and close the connection
-            await websocket.send_json({"event": "login", "success": False, "message": "Authentication failed"})
+            await websocket.send_text(_LOGIN_FAILURE)
             await websocket.close()
 
     except WebSocketDisconnect:
@@ -179,11 +230,22 @@ async def websocket_private(websocket: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        ssl_keyfile="key.pem",
-        ssl_certfile="cert.pem",
-    )
\ No newline at end of file
+    # Auto-reload is incompatible with multiple workers, so it is opt-in via DEV=1.
+    dev_mode = os.getenv("DEV") == "1"
+    # Create the shared file once, before any worker starts, and remove it only
+    # after every worker has exited, so no worker can delete it from under another.
+    create_data_file()
+    try:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=dev_mode,
+            workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+            ssl_keyfile="key.pem",
+            ssl_certfile="cert.pem",
+        )
+    finally:
+        remove_data_file()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import asyncio
 import ssl
-import json
 import argparse
+import orjson
 import websockets
 
 # Include the same auth payload generator from our tests
@@ -12,14 +12,17 @@ import base64
 
 DUMMY_API_KEY = "abc"
 DUMMY_API_SECRET = "def"
+VERIFY_SUFFIX = b'GET/users/self/verify'
+# Encoded once rather than on every login.
+_SECRET = DUMMY_API_SECRET.encode('utf-8')
 
 
-def get_auth_payload(api_key, api_secret) -> dict:
-    timestamp = int(time.time() * 1000)
-    message = str(timestamp) + 'GET' + '/users/self/verify'
-    mac = hmac.new(bytes(api_secret, encoding='utf8'), bytes(message, encoding='utf-8'), digestmod='sha256')
-    sign = base64.b64encode(mac.digest()).decode()
-    return {"op": "login", "args": [{"apiKey": api_key, "passphrase": "pw", "timestamp": str(timestamp), "sign": sign}]}
+def get_auth_payload(api_key) -> dict:
+    timestamp = str(int(time.time() * 1000))
+    message = timestamp.encode('ascii') + VERIFY_SUFFIX
+    digest = hmac.digest(_SECRET, message, 'sha256')
+    sign = base64.b64encode(digest).decode()
+    return {"op": "login", "args": [{"apiKey": api_key, "passphrase": "pw", "timestamp": timestamp, "sign": sign}]}
 
 
 async def main():
@@ -57,9 +60,9 @@ async def main():
                 print("Stream connection closed by server.")
 
         elif args.endpoint == "private":
-            payload = get_auth_payload(DUMMY_API_KEY, DUMMY_API_SECRET)
-            print(f"> Sending login request: {json.dumps(payload)}")
-            await websocket.send(json.dumps(payload))
+            payload = orjson.dumps(get_auth_payload(DUMMY_API_KEY)).decode()
+            print(f"> Sending login request: {payload}")
+            await websocket.send(payload)
             response = await websocket.recv()
             print(f"< Received: {response}")
 
@@ -1,6 +1,7 @@
 import hmac
 import time
 import base64
+import pytest
 from fastapi.testclient import TestClient
 from main import app
 
@@ -32,44 +33,67 @@ def get_auth_payload(api_key, api_secret) -> dict:
     }
 
 
-def test_websocket_echo():
-    """Tests the /ws/echo endpoint."""
+@pytest.fixture(scope="module")
+def client():
+    """One client for the module, so the app lifespan runs only once."""
     with TestClient(app) as client:
-        with client.websocket_connect("/ws/echo") as websocket:
-            test_message = "Hello, WebSocket!"
-            websocket.send_text(test_message)
-            response = websocket.receive_text()
-            assert response == f"Echo: {test_message}"
+        yield client
+
+
+def test_websocket_echo(client):
+    """Tests the /ws/echo endpoint."""
+    with client.websocket_connect("/ws/echo") as websocket:
+        test_message = "Hello, WebSocket!"
+        websocket.send_text(test_message)
+        response = websocket.receive_text()
+        assert response == f"Echo: {test_message}"
 
 
-def test_websocket_stream():
+def test_websocket_echo_binary(client):
+    """Tests that /ws/echo passes binary frames through as bytes."""
+    with client.websocket_connect("/ws/echo") as websocket:
+        test_message = b"\x00\xffHello, bytes!"
+        websocket.send_bytes(test_message)
+        response = websocket.receive_bytes()
+        assert response == b"Echo: " + test_message
+
+
+def test_websocket_stream(client):
     """Tests the /ws/stream endpoint for a few messages."""
-    with TestClient(app) as client:
-        with client.websocket_connect("/ws/stream") as websocket:
-            # Receive the first 3 messages from the stream
-            for _ in range(3):
-                response = websocket.receive_json()
-                assert "timestamp" in response
-                assert "message" in response
-            # The test client automatically closes the connection here.
+    with client.websocket_connect("/ws/stream") as websocket:
+        # Receive the first 3 messages from the stream
+        for _ in range(3):
+            response = websocket.receive_json()
+            assert "timestamp" in response
+            assert "message" in response
+        # The test client automatically closes the connection here.
 
 
-def test_websocket_private_auth_success():
+def test_websocket_private_auth_success(client):
     """Tests a successful authentication on the private endpoint."""
-    with TestClient(app) as client:
-        with client.websocket_connect("/ws/v5/private") as websocket:
-            payload = get_auth_payload(DUMMY_API_KEY, DUMMY_API_SECRET)
-            websocket.send_json(payload)
-            response = websocket.receive_json()
-            assert response == {"event": "login", "success": True}
+    with client.websocket_connect("/ws/v5/private") as websocket:
+        payload = get_auth_payload(DUMMY_API_KEY, DUMMY_API_SECRET)
+        websocket.send_json(payload)
+        response = websocket.receive_json()
+        assert response == {"event": "login", "success": True}
 
 
-def test_websocket_private_auth_failure():
+def test_websocket_private_auth_failure(client):
     """Tests a failed authentication with a bad secret."""
-    with TestClient(app) as client:
-        with client.websocket_connect("/ws/v5/private") as websocket:
-            payload = get_auth_payload(DUMMY_API_KEY, "BAD_SECRET")
-            websocket.send_json(payload)
-            response = websocket.receive_json()
-            assert response["event"] == "login"
-            assert response["success"] is False
+    with client.websocket_connect("/ws/v5/private") as websocket:
+        payload = get_auth_payload(DUMMY_API_KEY, "BAD_SECRET")
+        websocket.send_json(payload)
+        response = websocket.receive_json()
+        assert response["event"] == "login"
+        assert response["success"] is False
+
+
+def test_websocket_private_auth_rejects_non_digit_timestamp(client):
+    """Tests that a timestamp which is not an ASCII digit string fails login."""
+    with client.websocket_connect("/ws/v5/private") as websocket:
+        payload = get_auth_payload(DUMMY_API_KEY, DUMMY_API_SECRET)
+        payload["args"][0]["timestamp"] = int(payload["args"][0]["timestamp"])
+        websocket.send_json(payload)
+        response = websocket.receive_json()
+        assert response["event"] == "login"
+        assert response["success"] is False
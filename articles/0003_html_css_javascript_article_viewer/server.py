@@ -1,12 +1,23 @@
+import asyncio
+import gzip
+import mimetypes
+import os
 import re
-import uvicorn
+import stat
+import orjson
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import formatdate
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # --- Configuration ---
 # All paths are relative to the user's home directory inside the container.
@@ -20,15 +31,147 @@ STATIC_DIR = VIEWER_DIR / "static"
 CERT_FILE = DATA_DIR / "cert.pem"
 KEY_FILE = DATA_DIR / "key.pem"
 
+# READMEs smaller than this are held in memory; larger ones are streamed from disk.
+README_CACHE_LIMIT = 256 * 1024
+
+# Matches the numeric ordering prefix of an article slug, e.g. "0001_".
+SLUG_PREFIX_PATTERN = re.compile(r"^\d+_")
+
+# Matches each entry of an If-None-Match list: "*" or an entity tag, with
+# the opaque quoted part captured apart from any weak "W/" prefix.
+ETAG_LIST_PATTERN = re.compile(r'\*|(?:W/)?("[^"]*")')
+
+
+# --- Catalog Records ---
+# The catalog is immutable after startup; slotted records keep each entry
+# small and make field access an attribute load rather than a dict lookup.
+@dataclass(slots=True, frozen=True)
+class StaticFile:
+    path: str
+    stat: os.stat_result
+    etag: str
+    content_type: str
+
+
+@dataclass(slots=True, frozen=True)
+class Article:
+    slug: str
+    title: str
+    path: str
+    etag: str
+    body: bytes | None
+    headers: dict[str, str]
+    static_files: dict[str, StaticFile]
+
 
 def format_title(slug: str) -> str:
     """Converts a directory slug into a human-readable title."""
     # Remove leading digits and underscores, replace underscores with spaces, and title case.
     # e.g., "0001_basic_fastapi" -> "Basic Fastapi"
-    cleaned_slug = re.sub(r"^\d+_", "", slug)
+    cleaned_slug = SLUG_PREFIX_PATTERN.sub("", slug, count=1)
     return cleaned_slug.replace("_", " ").title()
 
 
+def make_etag(stat_result: os.stat_result) -> str:
+    """Builds a strong ETag from a file's modification time and size."""
+    # e.g., mtime 1700000000 and size 4096 -> "1700000000-1000"
+    return f'"{int(stat_result.st_mtime)}-{stat_result.st_size:x}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Checks an If-None-Match header against an ETag using weak comparison."""
+    # e.g., 'W/"1-a", "2-b"' matches both "1-a" and W/"2-b"; "*" matches anything.
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    for match in ETAG_LIST_PATTERN.finditer(if_none_match):
+        if match.group(1) is None or match.group(1) == opaque_tag:
+            return True
+    return False
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Maps each content coding in an Accept-Encoding header to its q-value."""
+    # e.g., "gzip, br;q=0" -> {"gzip": 1.0, "br": 0.0}
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def scan_static_files(static_dir: str, prefix: str = "", static_root: str | None = None) -> dict[str, StaticFile]:
+    """Maps every file below an article's static directory, keyed by its URL path."""
+    if static_root is None:
+        static_root = os.path.realpath(static_dir) + os.sep
+    static_files = {}
+    try:
+        with os.scandir(static_dir) as entries:
+            for entry in entries:
+                # Requests can only reach files listed here, so a symlink that
+                # resolves outside the static directory is simply never listed.
+                if entry.is_symlink() and not os.path.realpath(entry.path).startswith(static_root):
+                    continue
+                relative_path = prefix + entry.name
+                # Directory symlinks are not followed, so a link back up the
+                # tree cannot make the scan recurse forever.
+                if entry.is_dir(follow_symlinks=False):
+                    static_files.update(scan_static_files(entry.path, relative_path + "/", static_root))
+                elif entry.is_file():
+                    stat_result = entry.stat()
+                    static_files[relative_path] = StaticFile(
+                        path=entry.path,
+                        stat=stat_result,
+                        etag=make_etag(stat_result),
+                        # Unknown types are served as opaque bytes.
+                        content_type=mimetypes.guess_type(entry.name)[0] or "application/octet-stream",
+                    )
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return static_files
+
+
+def probe_article(entry: os.DirEntry) -> Article | None:
+    """Builds the catalog entry for one directory, or None if it has no README."""
+    # A single stat both checks the README and supplies its ETag.
+    readme_path = os.path.join(entry.path, "README.md")
+    try:
+        readme_stat = os.stat(readme_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not stat.S_ISREG(readme_stat.st_mode):
+        return None
+    etag = make_etag(readme_stat)
+    headers = {"etag": etag, "cache-control": "public, max-age=3600"}
+    body = None
+    if readme_stat.st_size < README_CACHE_LIMIT:
+        with open(readme_path, "rb") as readme_file:
+            body = readme_file.read()
+        # Stamp the headers FileResponse would have derived from the file.
+        headers["last-modified"] = formatdate(readme_stat.st_mtime, usegmt=True)
+        headers["content-length"] = str(len(body))
+    return Article(
+        slug=entry.name,
+        title=format_title(entry.name),
+        path=readme_path,
+        etag=etag,
+        body=body,
+        headers=headers,
+        static_files=scan_static_files(os.path.join(entry.path, "static")),
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -38,16 +181,33 @@ async def lifespan(app: FastAPI):
     print("Server is starting up, building article catalog...")
     articles = []
     if ARTICLES_DIR.is_dir():
-        for item in sorted(ARTICLES_DIR.iterdir()):
-            if item.is_dir() and (item / "README.md").is_file():
-                slug = item.name
-                articles.append({
-                    "slug": slug,
-                    "title": format_title(slug),
-                    "path": item / "README.md"
-                })
-    app.state.articles_catalog = {article["slug"]: article for article in articles}
+        # scandir reports each entry's type from the directory listing itself,
+        # so telling directories from files costs no extra stat calls.
+        with os.scandir(ARTICLES_DIR) as entries:
+            article_dirs = sorted((entry for entry in entries if entry.is_dir()), key=lambda entry: entry.name)
+        # Probe the directories in parallel threads so a slow filesystem does
+        # not serialize startup; gather keeps the results in sorted order.
+        probes = await asyncio.gather(
+            *(asyncio.to_thread(probe_article, entry) for entry in article_dirs)
+        )
+        articles = [article for article in probes if article is not None]
+    app.state.articles_catalog = {article.slug: article for article in articles}
+    # The catalog never changes after startup, so encode the index response once.
+    app.state.articles_index_json = orjson.dumps(
+        [{"slug": article.slug, "title": article.title} for article in articles]
+    )
     print(f"Found {len(articles)} articles.")
+    # The SPA shell is plain HTML with no per-request data, so read and
+    # compress it once. A weak ETag covers every encoding of the same file.
+    index_path = TEMPLATES_DIR / "index.html"
+    index_html = index_path.read_bytes()
+    app.state.index_etag = "W/" + make_etag(index_path.stat())
+    app.state.index_variants = {
+        "identity": index_html,
+        "gzip": gzip.compress(index_html, compresslevel=9),
+    }
+    if brotli is not None:
+        app.state.index_variants["br"] = brotli.compress(index_html, quality=11)
     yield
     print("Server is shutting down.")
 
@@ -58,67 +218,115 @@ app = FastAPI(lifespan=lifespan)
 # Mount the static directory to serve CSS and JavaScript files.
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Configure Jinja2 for HTML templating.
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
-
 
 # --- API Endpoints ---
 @app.get("/api/articles")
 async def get_articles_index():
     """Returns a list of all discovered articles (slug and title)."""
-    if not hasattr(app.state, "articles_catalog") or not app.state.articles_catalog:
-        return []
-    # Return a list of dicts, excluding the server-side file path.
-    return [
-        {"slug": data["slug"], "title": data["title"]}
-        for data in app.state.articles_catalog.values()
-    ]
+    # lifespan encodes this before the first request, "[]" when nothing was found.
+    # Serve the pre-encoded list of dicts, which excludes the server-side file path.
+    return Response(content=app.state.articles_index_json, media_type="application/json")
 
 
-@app.get("/articles/{article_slug}/static/{file_path:path}")
-async def serve_article_static(article_slug: str, file_path: str):
+async def serve_article_static(request: Request):
     """Serves a static file from within a specific article's directory."""
+    article_slug = request.path_params["article_slug"]
+    file_path = request.path_params["file_path"]
     if article_slug not in app.state.articles_catalog:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    # Construct the full path to the static file
-    article_dir = app.state.articles_catalog[article_slug]["path"].parent
-    static_file_path = article_dir / "static" / file_path
-
-    if not static_file_path.is_file():
+    # Every servable file was found at startup, so a miss here is the 404.
+    # Paths such as "../README.md" are never keys, which rejects traversal
+    # without touching the filesystem.
+    static_file = app.state.articles_catalog[article_slug].static_files.get(file_path)
+    if static_file is None:
         raise HTTPException(status_code=404, detail="Static file not found")
 
-    return FileResponse(static_file_path)
+    # A client that already holds this version only needs the headers.
+    etag = static_file.etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"etag": etag})
+
+    # Passing the stat result lets FileResponse skip its own stat and emit
+    # `http.response.pathsend` when the server advertises that extension.
+    return FileResponse(
+        static_file.path,
+        media_type=static_file.content_type,
+        stat_result=static_file.stat,
+        headers={"etag": etag, "cache-control": "public, max-age=3600"},
+    )
+
+
+# Registered as a plain Starlette route: the endpoint reads its two path
+# parameters itself, so the busiest route skips FastAPI's per-request
+# parameter parsing and validation.
+app.add_route(
+    "/articles/{article_slug}/static/{file_path:path}",
+    serve_article_static,
+    methods=["GET"],
+    include_in_schema=False,
+)
 
 
 @app.get("/api/articles/{article_slug}")
-async def get_article_content(article_slug: str):
+async def get_article_content(article_slug: str, request: Request):
     """Returns the raw Markdown content of a specific article."""
     if article_slug not in app.state.articles_catalog:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    file_path = app.state.articles_catalog[article_slug]["path"]
-    return FileResponse(file_path, media_type="text/markdown; charset=utf-8")
+    article = app.state.articles_catalog[article_slug]
+    if etag_matches(request.headers.get("if-none-match"), article.etag):
+        return Response(status_code=304, headers={"etag": article.etag})
+
+    if article.body is not None:
+        return Response(content=article.body, media_type="text/markdown; charset=utf-8", headers=article.headers)
+    return FileResponse(article.path, media_type="text/markdown; charset=utf-8", headers=article.headers)
 
 
 # --- Frontend Serving ---
 @app.get("/")
 async def serve_frontend(request: Request):
     """Serves the main index.html single-page application."""
-    return templates.TemplateResponse({"request": request}, "index.html")
+    headers = {"etag": app.state.index_etag, "vary": "accept-encoding", "cache-control": "public, max-age=60"}
+    if etag_matches(request.headers.get("if-none-match"), app.state.index_etag):
+        return Response(status_code=304, headers=headers)
+
+    variants = app.state.index_variants
+    weights = parse_accept_encoding(request.headers.get("accept-encoding", ""))
+    # Prefer Brotli, then gzip, then the uncompressed bytes. Codings the client
+    # did not list fall under "*"; a q of 0 refuses a coding.
+    for encoding in ("br", "gzip"):
+        if encoding in variants and weights.get(encoding, weights.get("*", 0.0)) > 0:
+            headers["content-encoding"] = encoding
+            return HTMLResponse(variants[encoding], headers=headers)
+    if weights.get("identity", weights.get("*", 1.0)) <= 0:
+        return Response(status_code=406, headers=headers)
+    return HTMLResponse(variants["identity"], headers=headers)
 
 
 # --- Main Entry Point ---
 if __name__ == "__main__":
     """
     Allows the server to be run with `python3 server.py`.
-    Configures Uvicorn to use the shared TLS certificates.
+    Configures Hypercorn to use the shared TLS certificates and to offer
+    HTTP/2 through ALPN, so the page and its assets share one multiplexed
+    connection, with HTTP/1.1 as the fallback. Workers run on the libuv-based
+    uvloop event loop. Outside of development it starts 2n+1 worker processes
+    (override with WEB_CONCURRENCY); each worker builds its own read-only
+    catalog in `lifespan`. Set DEV=1 to run a single auto-reloading process
+    while editing.
     """
-    uvicorn.run(
-        "server:app",
-        host="0.0.0.0",
-        port=8889,  # Matches the port exposed in the Dockerfile
-        reload=True,
-        ssl_keyfile=str(KEY_FILE),
-        ssl_certfile=str(CERT_FILE),
-    )
\ No newline at end of file
+    from hypercorn.config import Config
+    from hypercorn.run import run
+
+    dev_mode = os.environ.get("DEV") == "1"
+    config = Config()
+    config.application_path = "server:app"
+    config.bind = ["0.0.0.0:8889"]  # Matches the port exposed in the Dockerfile
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.certfile = str(CERT_FILE)
+    config.keyfile = str(KEY_FILE)
+    config.worker_class = "uvloop"
+    config.use_reloader = dev_mode
+    config.workers = 1 if dev_mode else int(os.environ.get("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+    run(config)
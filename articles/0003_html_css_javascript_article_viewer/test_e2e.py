@@ -30,18 +30,19 @@ def live_server_process():
 
         # Wait for the server to be ready with a robust polling loop.
         host, port = "127.0.0.1", 8889
-        for _ in range(100):  # Poll for up to 10 seconds
-            try:
-                with socket.create_connection((host, port), timeout=0.1):
-                    # If the connection succeeds, the server is up.
+        deadline = time.monotonic() + 10  # Poll for up to 10 seconds
+        while True:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                probe.settimeout(0.1)
+                # connect_ex reports refusal as an errno instead of raising.
+                if probe.connect_ex((host, port)) == 0:
                     break
-            except (ConnectionRefusedError, socket.timeout):
-                # If refused or timeout, wait and retry.
-                time.sleep(0.1)
-        else:
-            # If the loop finishes without breaking, the server failed to start.
-            subprocess.run("tmux kill-session -t test_server", shell=True)
-            pytest.fail(f"Server at {host}:{port} did not start within 10 seconds.")
+            if time.monotonic() >= deadline:
+                # The deadline passed without a connection, the server failed to start.
+                subprocess.run("tmux kill-session -t test_server", shell=True)
+                pytest.fail(f"Server at {host}:{port} did not start within 10 seconds.")
+            # Short backoff so a fast startup is noticed within ~20ms.
+            time.sleep(0.02)
 
         yield BASE_URL  # The tests run at this point
 
@@ -51,58 +52,58 @@ def live_server_process():
         subprocess.run(kill_cmd, shell=True, stderr=subprocess.DEVNULL)
 
 
-# --- E2E Test Cases ---
-def test_page_load_and_sidebar(live_server_process):
-    """Tests that the page loads and the sidebar populates with REAL articles."""
+@pytest.fixture(scope="session")
+def browser():
+    """A single Chromium instance shared by every test; each test opens its own context."""
     with sync_playwright() as p:
         browser = p.chromium.launch()
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-        page.goto(BASE_URL)
-
-        expect(page).to_have_title("Article Viewer")
-
-        # Assert that your actual articles appear in the sidebar
-        sidebar = page.locator("#article-list")
-        expect(sidebar.get_by_role("link", name="Basic Fastapi")).to_be_visible()
-        expect(sidebar.get_by_role("link", name="Docker Dev Environment")).to_be_visible()
-        expect(sidebar.get_by_role("link", name="Html Css Javascript Article Viewer")).to_be_visible()
-        context.close()
+        yield browser
         browser.close()
 
 
-def test_article_click_and_render(live_server_process):
+# --- E2E Test Cases ---
+def test_page_load_and_sidebar(live_server_process, browser):
+    """Tests that the page loads and the sidebar populates with REAL articles."""
+    context = browser.new_context(ignore_https_errors=True)
+    page = context.new_page()
+    page.goto(BASE_URL)
+
+    expect(page).to_have_title("Article Viewer")
+
+    # Assert that your actual articles appear in the sidebar
+    sidebar = page.locator("#article-list")
+    expect(sidebar.get_by_role("link", name="Basic Fastapi")).to_be_visible()
+    expect(sidebar.get_by_role("link", name="Docker Dev Environment")).to_be_visible()
+    expect(sidebar.get_by_role("link", name="Html Css Javascript Article Viewer")).to_be_visible()
+    context.close()
+
+
+def test_article_click_and_render(live_server_process, browser):
     """Tests clicking an article and verifying its content is rendered."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-        page.goto(BASE_URL)
+    context = browser.new_context(ignore_https_errors=True)
+    page = context.new_page()
+    page.goto(BASE_URL)
 
-        page.get_by_role("link", name="Docker Dev Environment").click()
+    page.get_by_role("link", name="Docker Dev Environment").click()
 
-        # Check for a unique heading from the real Docker article
-        content_heading = page.locator("#content h2", has_text="A Primer on Isolation")
-        expect(content_heading).to_be_visible()
-        context.close()
-        browser.close()
+    # Check for a unique heading from the real Docker article
+    content_heading = page.locator("#content h2", has_text="A Primer on Isolation")
+    expect(content_heading).to_be_visible()
+    context.close()
 
 
-def test_code_block_highlighting(live_server_process):
+def test_code_block_highlighting(live_server_process, browser):
     """Tests that highlight.js correctly processes code blocks."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-        page.goto(BASE_URL)
+    context = browser.new_context(ignore_https_errors=True)
+    page = context.new_page()
+    page.goto(BASE_URL)
 
-        page.get_by_role("link", name="Basic Fastapi").click()
+    page.get_by_role("link", name="Basic Fastapi").click()
 
-        # Assert that a span with a highlight.js class exists in a known code block
-        highlighted_keyword = page.locator("span.hljs-keyword", has_text="from")
-        expect(highlighted_keyword.first).to_be_visible()
-        context.close()
-        browser.close()
+    # Assert that a span with a highlight.js class exists in a known code block
+    highlighted_keyword = page.locator("span.hljs-keyword", has_text="from")
+    expect(highlighted_keyword.first).to_be_visible()
+    context.close()
 
 def test_sleep():
     """Just here to ensure that our server closes properly after the last test"""
@@ -44,6 +44,19 @@ def test_format_title():
     assert viewer_server.format_title("another_long_slug_here") == "Another Long Slug Here"
 
 
+def test_etag_matches():
+    """Tests If-None-Match lists, the "*" wildcard and weak comparison."""
+    assert viewer_server.etag_matches('"1-a"', '"1-a"')
+    assert viewer_server.etag_matches('"0-0", "1-a"', '"1-a"')
+    assert viewer_server.etag_matches('W/"1-a"', '"1-a"')
+    assert viewer_server.etag_matches('"1-a"', 'W/"1-a"')
+    assert viewer_server.etag_matches("*", '"1-a"')
+    assert not viewer_server.etag_matches('"1-b"', '"1-a"')
+    assert not viewer_server.etag_matches('"*"', '"1-a"')
+    assert not viewer_server.etag_matches(None, '"1-a"')
+    assert not viewer_server.etag_matches("", '"1-a"')
+
+
 # --- API Tests ---
 
 def test_get_articles_index_success(mock_fs):
@@ -99,6 +112,8 @@ def test_get_article_content_success(mock_fs):
         assert response.status_code == 200
         assert response.text == "# Hello World"
         assert response.headers["content-type"] == "text/markdown; charset=utf-8"
+        assert response.headers["content-length"] == str(len("# Hello World"))
+        assert "last-modified" in response.headers
 
 
 def test_get_article_content_not_found(mock_fs):
@@ -124,6 +139,7 @@ def test_serve_article_static_success(mock_fs):
         # Assert
         assert response.status_code == 200
         assert response.text == "fake_image_data"
+        assert response.headers["content-type"] == "image/png"
 
 
 def test_serve_article_static_article_not_found(mock_fs):
@@ -169,4 +185,215 @@ def test_serve_frontend(mock_fs):
         # Assert: The response must be successful and the content must exactly
         # match the content of the real template file.
         assert response.status_code == 200
-        assert response.text == real_template_path.read_text()
\ No newline at end of file
+        assert response.text == real_template_path.read_text()
+
+
+def test_serve_frontend_negotiates_encoding(mock_fs):
+    """
+    Tests that the pre-compressed shell is chosen from Accept-Encoding and
+    that clients without compression support get the plain bytes.
+    """
+    with TestClient(viewer_server.app) as client:
+        # Act: Ask for gzip first, then for no compression at all.
+        compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/", headers={"Accept-Encoding": "identity"})
+
+        # Assert: Both decode to the same page; only the first is encoded.
+        assert compressed.status_code == 200
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert compressed.text == plain.text
+        assert plain.headers["vary"] == "accept-encoding"
+
+
+def test_serve_frontend_honours_refused_encodings(mock_fs):
+    """
+    Tests that codings refused with q=0, directly or through "*", are never
+    chosen, and that refusing every coding yields 406.
+    """
+    with TestClient(viewer_server.app) as client:
+        # Act: Refuse both compressed variants, then everything but gzip,
+        # then everything including the plain bytes.
+        refused = client.get("/", headers={"Accept-Encoding": "br;q=0, gzip;q=0"})
+        gzip_only = client.get("/", headers={"Accept-Encoding": "gzip;q=0.5, *;q=0"})
+        nothing = client.get("/", headers={"Accept-Encoding": "gzip;q=0, br;q=0, identity;q=0"})
+
+        # Assert
+        assert refused.status_code == 200
+        assert "content-encoding" not in refused.headers
+        assert gzip_only.headers["content-encoding"] == "gzip"
+        assert nothing.status_code == 406
+
+
+def test_get_article_content_not_modified(mock_fs):
+    """Tests that a matching If-None-Match turns an article fetch into a 304."""
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").write_text("# Hello World")
+
+    with TestClient(viewer_server.app) as client:
+        # Act: Fetch once to learn the ETag, then revalidate with it.
+        first = client.get("/api/articles/0001_my_article")
+        etag = first.headers["etag"]
+        second = client.get("/api/articles/0001_my_article", headers={"If-None-Match": etag})
+
+        # Assert
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+
+
+def test_get_article_content_not_modified_by_list(mock_fs):
+    """Tests that an If-None-Match list or weak tag containing the ETag also yields a 304."""
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").write_text("# Hello World")
+
+    with TestClient(viewer_server.app) as client:
+        # Act
+        etag = client.get("/api/articles/0001_my_article").headers["etag"]
+        listed = client.get("/api/articles/0001_my_article", headers={"If-None-Match": f'"stale", {etag}'})
+        weak = client.get("/api/articles/0001_my_article", headers={"If-None-Match": f"W/{etag}"})
+        stale = client.get("/api/articles/0001_my_article", headers={"If-None-Match": '"stale"'})
+
+        # Assert
+        assert listed.status_code == 304
+        assert weak.status_code == 304
+        assert stale.status_code == 200
+
+
+def test_serve_article_static_not_modified(mock_fs):
+    """Tests that a matching If-None-Match turns a static file fetch into a 304."""
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").touch()
+    static_dir = article_dir / "static"
+    static_dir.mkdir()
+    (static_dir / "image.png").write_text("fake_image_data")
+
+    with TestClient(viewer_server.app) as client:
+        # Act
+        first = client.get("/articles/0001_my_article/static/image.png")
+        etag = first.headers["etag"]
+        second = client.get("/articles/0001_my_article/static/image.png", headers={"If-None-Match": etag})
+
+        # Assert
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+
+
+def test_serve_article_static_nested_file(mock_fs):
+    """Tests that files in subdirectories of an article's static folder are served."""
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").touch()
+    nested_dir = article_dir / "static" / "images"
+    nested_dir.mkdir(parents=True)
+    (nested_dir / "diagram.svg").write_text("<svg></svg>")
+
+    with TestClient(viewer_server.app) as client:
+        # Act
+        response = client.get("/articles/0001_my_article/static/images/diagram.svg")
+        # Assert
+        assert response.status_code == 200
+        assert response.text == "<svg></svg>"
+
+
+def test_serve_article_static_unknown_type(mock_fs):
+    """Tests that files with an unrecognised extension are served as opaque bytes."""
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").touch()
+    (article_dir / "static").mkdir()
+    (article_dir / "static" / "data.unknownext").write_bytes(b"\x00\x01")
+
+    with TestClient(viewer_server.app) as client:
+        # Act
+        response = client.get("/articles/0001_my_article/static/data.unknownext")
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.content == b"\x00\x01"
+
+
+def test_serve_article_static_ignores_directory_symlink_loops(mock_fs):
+    """Tests that a directory symlink pointing back up the tree does not break the scan."""
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").touch()
+    static_dir = article_dir / "static"
+    (static_dir / "images").mkdir(parents=True)
+    (static_dir / "images" / "diagram.svg").write_text("<svg></svg>")
+    (static_dir / "images" / "loop").symlink_to(static_dir / "images", target_is_directory=True)
+
+    with TestClient(viewer_server.app) as client:
+        # Act
+        response = client.get("/articles/0001_my_article/static/images/diagram.svg")
+        looped = client.get("/articles/0001_my_article/static/images/loop/diagram.svg")
+        # Assert
+        assert response.status_code == 200
+        assert response.text == "<svg></svg>"
+        assert looped.status_code == 404
+
+
+def test_serve_article_static_rejects_traversal(mock_fs):
+    """
+    Tests that neither "../" segments nor symlinks can reach files outside
+    an article's static folder.
+    """
+    # Arrange
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").write_text("# Private draft")
+    static_dir = article_dir / "static"
+    static_dir.mkdir()
+    (static_dir / "escape.md").symlink_to(article_dir / "README.md")
+
+    with TestClient(viewer_server.app) as client:
+        # Act: An encoded slash keeps the client from normalizing the "..".
+        traversal = client.get("/articles/0001_my_article/static/..%2FREADME.md")
+        symlink = client.get("/articles/0001_my_article/static/escape.md")
+        # Assert
+        assert traversal.status_code == 404
+        assert symlink.status_code == 404
+
+
+def test_get_article_content_streams_large_readme(mock_fs, monkeypatch):
+    """Tests that READMEs over the in-memory cache limit are still served in full."""
+    # Arrange: Lower the limit so a small file takes the streaming path.
+    monkeypatch.setattr(viewer_server, "README_CACHE_LIMIT", 8)
+    article_dir = mock_fs / "0001_my_article"
+    article_dir.mkdir()
+    (article_dir / "README.md").write_text("# A README longer than the limit")
+
+    with TestClient(viewer_server.app) as client:
+        # Act
+        response = client.get("/api/articles/0001_my_article")
+        # Assert
+        assert response.status_code == 200
+        assert response.text == "# A README longer than the limit"
+        assert response.headers["content-type"] == "text/markdown; charset=utf-8"
+
+
+def test_serve_frontend_not_modified(mock_fs):
+    """Tests that revalidating the index page with its ETag returns a 304."""
+    with TestClient(viewer_server.app) as client:
+        # Act
+        first = client.get("/")
+        second = client.get("/", headers={"If-None-Match": first.headers["etag"]})
+        # Proxies may drop the weak prefix; weak comparison still matches.
+        stripped = client.get("/", headers={"If-None-Match": first.headers["etag"].removeprefix("W/")})
+        # Assert
+        assert first.status_code == 200
+        assert first.headers["etag"].startswith("W/")
+        assert second.status_code == 304
+        assert second.content == b""
+        assert stripped.status_code == 304
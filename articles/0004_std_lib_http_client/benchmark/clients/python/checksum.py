@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def xor_checksum(data: bytes | memoryview) -> int:
+    # XOR is associative, so reduce the buffer as 64-bit words and fold the
+    # eight lanes of the result down to one byte afterwards.
+    octets = np.frombuffer(data, dtype=np.uint8)
+    split = octets.size & ~7
+    folded = int(np.bitwise_xor.reduce(octets[:split].view(np.uint64)))
+    folded ^= folded >> 32
+    folded ^= folded >> 16
+    folded ^= folded >> 8
+    return (folded ^ int(np.bitwise_xor.reduce(octets[split:]))) & 0xFF
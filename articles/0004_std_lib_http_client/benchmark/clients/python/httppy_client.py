@@ -1,11 +1,13 @@
 import argparse
-import struct
+import mmap
 import time
 import sys
-import functools
-import operator
 import traceback
 
+import numpy as np
+
+from checksum import xor_checksum
+
 from httppy.tcp_transport import TcpTransport
 from httppy.unix_transport import UnixTransport
 from httppy.http1_protocol import Http1Protocol
@@ -13,6 +15,13 @@ from httppy.httppy import HttpClient
 from httppy.http_protocol import HttpRequest, HttpMethod
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Benchmark client for the 'httppy' library.")
 
@@ -26,6 +35,7 @@ def parse_args():
 
     parser.add_argument('--no-verify', action='store_false', dest='verify', help="Disable checksum validation.")
     parser.add_argument('--unsafe', action='store_true', help="Use the unsafe/zero-copy response model.")
+    parser.add_argument("--pipeline", type=positive_int, default=1, help="Number of requests to send in one write before reading their responses.")
     parser.set_defaults(verify=True, unsafe=False)
 
     return parser.parse_args()
@@ -34,25 +44,21 @@ def parse_args():
 def read_benchmark_data(filename="benchmark_data.bin"):
     try:
         with open(filename, "rb") as f:
-            num_requests_bytes = f.read(8)
-            num_requests = struct.unpack('<Q', num_requests_bytes)[0]
-            sizes_bytes = f.read(num_requests * 8)
-            request_sizes = [size[0] for size in struct.iter_unpack('<Q', sizes_bytes)]
-            data_block = f.read()
+            num_requests = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+            # Decode the sizes in one vectorized pass, then hand the hot loop plain ints.
+            request_sizes = np.frombuffer(f.read(num_requests * 8), dtype='<u8').tolist()
+            # Map the payload instead of reading it; the mapping outlives the file handle.
+            data_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data_block = memoryview(data_map)[8 + num_requests * 8:]
         return request_sizes, data_block
     except FileNotFoundError:
         sys.exit(f"Error: Data file '{filename}' not found. Please run the data_generator first.")
 
 
-def xor_checksum(data: bytes) -> int:
-    return functools.reduce(operator.xor, data, 0)
-
-
 def main():
     args = parse_args()
-    request_sizes, data_block = read_benchmark_data(args.data_file)
-    data_block_view = memoryview(data_block)
-    latencies = [0] * args.num_requests
+    request_sizes, data_block_view = read_benchmark_data(args.data_file)
+    latencies = np.zeros(args.num_requests, dtype='<i8')
 
     if args.transport == "unix":
         transport = UnixTransport()
@@ -62,56 +68,84 @@ def main():
     protocol = Http1Protocol(transport)
     client = HttpClient(protocol)
 
+    # One request object and payload slot per pipelined request, reused for every batch.
+    slot_size = max(request_sizes) + 16
+    payload_buffer = bytearray(slot_size * args.pipeline)
+    payload_view = memoryview(payload_buffer)
+    requests = [
+        HttpRequest(method=HttpMethod.POST, path="/", headers=[("Content-Length", "0")])
+        for _ in range(args.pipeline)
+    ]
+
+    # Bind the hot callables once; safe/unsafe is fully decided by which receive method is bound
+    if args.unsafe:
+        recv_response = client.recv_response_unsafe
+    else:
+        recv_response = client.recv_response_safe
+    send_requests = client.send_requests
+    time_ns = time.time_ns
+    num_sizes = len(request_sizes)
+
+    # Format every Content-Length header once up front instead of calling str() per request
+    trailer_size = 16 if args.verify else 0
+    content_length_headers = {
+        size: ("Content-Length", str(size + trailer_size)) for size in set(request_sizes)
+    }
+
+    def fill_request_verify(slot, request, req_size):
+        # Copy the body into this slot's scratch space and append the checksum
+        body_slice = data_block_view[:req_size]
+        offset = slot * slot_size
+        payload_view[offset:offset + req_size] = body_slice
+        payload_view[offset + req_size:offset + req_size + 16] = b'%016x' % xor_checksum(body_slice)
+        request.body = payload_view[offset:offset + req_size + 16]
+        request.headers[0] = content_length_headers[req_size]
+
+    def fill_request_noverify(slot, request, req_size):
+        request.body = data_block_view[:req_size]
+        request.headers[0] = content_length_headers[req_size]
+
+    def record_response_verify(i):
+        response = recv_response()
+        client_receive_time = time_ns()
+
+        # View the body so the trailer slices below never copy the payload
+        response_view = memoryview(response.body)
+
+        calculated_checksum = xor_checksum(response_view[:-35])
+        # int() only accepts an explicit base for str/bytes, so copy the 16 hex digits
+        received_checksum = int(bytes(response_view[-35:-19]), 16)
+
+        if calculated_checksum != received_checksum:
+            print(f"Warning: Response checksum mismatch on request {i}!", file=sys.stderr)
+
+        latencies[i] = client_receive_time - int(response_view[-19:])
+
+    def record_response_noverify(i):
+        response = recv_response()
+        client_receive_time = time_ns()
+        latencies[i] = client_receive_time - int(memoryview(response.body)[-19:])
+
+    # Select the specialized variants once so the hot loop carries no mode checks
+    if args.verify:
+        fill_request, record_response = fill_request_verify, record_response_verify
+    else:
+        fill_request, record_response = fill_request_noverify, record_response_noverify
+
     try:
         client.connect(args.host, args.port)
 
-        for i in range(args.num_requests):
-            req_size = request_sizes[i % len(request_sizes)]
-            body_slice = data_block_view[:req_size]
-
-
-            payload = bytearray(body_slice)
-
-            # If verify is on, calculate and append the checksum
-            if args.verify:
-                checksum = xor_checksum(body_slice)
-                payload.extend(f'{checksum:016x}'.encode('ascii'))
-
-            request = HttpRequest(
-                path="/",
-                body=bytes(payload),
-                headers=[("Content-Length", str(len(payload)))]
-            )
-
-            # Send the request
-            if args.unsafe:
-                response = client.post_unsafe(request)
-            else:
-                response = client.post_safe(request)
-            client_receive_time = time.time_ns()
-
-            response_body = response.body
-
-            if args.verify:
-                res_payload = response_body[:-35]
-                res_checksum_hex = response_body[-35:-19]
-
-                calculated_checksum = xor_checksum(bytes(res_payload))
-
-                received_checksum_str = bytes(res_checksum_hex).decode('ascii')
-                received_checksum = int(received_checksum_str, 16)
-
-                if calculated_checksum != received_checksum:
-                    print(f"Warning: Response checksum mismatch on request {i}!", file=sys.stderr)
-
-            # Convert the memoryview to a string before parsing
-            server_timestamp_view = response_body[-19:]
-            server_timestamp_str = bytes(server_timestamp_view).decode('ascii')
-            server_timestamp = int(server_timestamp_str)
+        for batch_start in range(0, args.num_requests, args.pipeline):
+            batch = requests[:args.num_requests - batch_start]
 
-            latencies[i] = client_receive_time - server_timestamp
+            for slot, request in enumerate(batch):
+                fill_request(slot, request, request_sizes[(batch_start + slot) % num_sizes])
 
+            # Write the whole batch with a single syscall, then reap its responses in order
+            send_requests(batch)
 
+            for i in range(batch_start, batch_start + len(batch)):
+                record_response(i)
 
     except Exception as e:
         sys.exit(f"An error occurred: {e}")
@@ -120,7 +154,7 @@ def main():
 
     # 3. Save Results
     with open(args.output_file, "wb") as f:
-        f.write(struct.pack(f'<{len(latencies)}q', *latencies))
+        latencies.tofile(f)
 
     print(f"httppy_client: completed {args.num_requests} requests and saved latencies to {args.output_file}.")
 
@@ -1,17 +1,19 @@
 import argparse
+import itertools
 import struct
 import time
-import functools
-import operator
 import sys
 
 
 from urllib.parse import quote
 
 
+import numpy as np
 import requests
 import requests_unixsocket
 
+from checksum import xor_checksum
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Benchmark client for the 'requests' library.")
@@ -45,57 +47,74 @@ def read_benchmark_data(filename="benchmark_data.bin"):
     return request_sizes, data_block
 
 
-def xor_checksum(data: bytes) -> int:
-    return functools.reduce(operator.xor, data, 0)
-
-
 def main():
     args = parse_args()
     request_sizes, data_block = read_benchmark_data(args.data_file)
     data_block_view = memoryview(data_block)
-    latencies = [0] * args.num_requests
+    latencies = np.zeros(args.num_requests, dtype='<i8')
 
     if args.transport == "unix":
         session = requests_unixsocket.Session()
         base_url = f"http+unix://{quote(args.host, safe='')}"
+        adapter = requests_unixsocket.UnixAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        session.mount("http+unix://", adapter)
     else:
         session = requests.Session()
         base_url = f"http://{args.host}:{args.port}"
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        session.mount("http://", adapter)
 
-    with session:
-        for i in range(args.num_requests):
-            req_size = request_sizes[i % len(request_sizes)]
-            body_slice = data_block_view[:req_size]
+    # Send straight through the adapter: the urllib3 round trip and Response
+    # construction stay, while per-call hooks, cookie and redirect handling go.
+    send = adapter.send
 
-            payload = bytearray(body_slice)
-            if args.verify:
-                checksum = xor_checksum(body_slice)
-                payload.extend(f'{checksum:016x}'.encode('ascii'))
+    # Prepare the request once; each iteration only swaps the body and its length.
+    prepared = session.prepare_request(requests.Request("POST", f"{base_url}/", data=b""))
+
+    # Hoist loop invariants into locals so the hot loop does no attribute lookups for them.
+    verify = args.verify
+    time_ns = time.time_ns
+    prepared_headers = prepared.headers
+    # Format every Content-Length value once up front instead of calling str() per request
+    trailer_size = 16 if verify else 0
+    content_lengths = {size: str(size + trailer_size) for size in set(request_sizes)}
+
+    with session:
+        for i, req_size in zip(range(args.num_requests), itertools.cycle(request_sizes)):
+            # requests streams anything that is not bytes, so each branch makes exactly one bytes copy
+            if verify:
+                body_slice = data_block_view[:req_size]
+                # join sizes the result up front and copies the view and the hex digits straight in
+                payload = b"".join((body_slice, b'%016x' % xor_checksum(body_slice)))
+            else:
+                payload = data_block[:req_size]
 
             try:
-                response = session.post(f"{base_url}/", data=bytes(payload))
-                client_receive_time = time.time_ns()
+                prepared.body = payload
+                prepared_headers["Content-Length"] = content_lengths[req_size]
+                response = send(prepared)
+                # adapter.send leaves the body unread, so pull it in before
+                # stamping the receive time, as Session.send would have done.
+                response_body = response.content
+                client_receive_time = time_ns()
             except requests.exceptions.RequestException as e:
                 sys.exit(f"Error during request {i}: {e}")
 
             if response.status_code != 200:
                 sys.exit(f"Error: Received status code {response.status_code} on request {i}")
 
-            response_body = response.content
-            if args.verify:
-                res_payload = response_body[:-35]
-                res_checksum_hex = response_body[-35:-19]
-                calculated_checksum = xor_checksum(res_payload)
-                received_checksum = int(res_checksum_hex, 16)
+            if verify:
+                # Checksum the payload through a view; only the 35 trailer bytes are ever copied
+                calculated_checksum = xor_checksum(memoryview(response_body)[:-35])
+                received_checksum = int(response_body[-35:-19], 16)
                 if calculated_checksum != received_checksum:
                     print(f"Warning: Response checksum mismatch on request {i}!", file=sys.stderr)
 
-            server_timestamp_str = response_body[-19:]
-            server_timestamp = int(server_timestamp_str)
+            server_timestamp = int(response_body[-19:])
             latencies[i] = client_receive_time - server_timestamp
 
     with open(args.output_file, "wb") as f:
-        f.write(struct.pack(f'<{len(latencies)}q', *latencies))
+        latencies.tofile(f)
 
     print(f"requests_client: completed {args.num_requests} requests and saved latencies to {args.output_file}.")
 
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from .transport import Transport
 from .http_protocol import HttpProtocol, HttpRequest, SafeHttpResponse, UnsafeHttpResponse, HttpMethod
 from .errors import HttpParseError, ConnectionClosedError
@@ -6,109 +8,299 @@ from .errors import HttpParseError, ConnectionClosedError
 class Http1Protocol(HttpProtocol):
     _HEADER_SEPARATOR = b"\r\n\r\n"
     _HEADER_SEPARATOR_CL = b"Content-Length:"
+    _HEADER_SEPARATOR_CL_LOWER = b"content-length:"
+    _METHOD_BYTES = {HttpMethod.GET: b"GET ", HttpMethod.POST: b"POST "}
+    _STATUS_CODES = {b"%d" % code: code for code in range(100, 600)}
+    _INITIAL_BUFFER_SIZE = 65536
+    # Largest step a body read grows the buffer by; the rest waits for the bytes.
+    _MAX_BODY_READ = 1 << 20
+    _MAX_CACHE_ENTRIES = 1024
 
     def __init__(self, transport: Transport):
         self._transport: Transport = transport
-        self._buffer: bytearray = bytearray()
+        self._buffer: bytearray = bytearray(self._INITIAL_BUFFER_SIZE)
+        self._filled: int = 0
+        self._response_end: int = 0
         self._header_size: int = 0
         self._content_length: int | None = None
+        self._request_line_cache: dict[tuple[HttpMethod, str], bytes] = {}
+        self._header_line_cache: dict[tuple[str, str], bytes] = {}
+        self._request_head_cache: dict[tuple, bytes] = {}
 
     def connect(self, host: str, port: int) -> None:
+        self._filled = self._response_end = 0
         self._transport.connect(host, port)
 
     def disconnect(self) -> None:
+        self._filled = self._response_end = 0
         self._transport.close()
 
     def perform_request_safe(self, request: HttpRequest) -> SafeHttpResponse:
-        unsafe_res = self.perform_request_unsafe(request)
-
-        status_message = unsafe_res.status_message.tobytes().decode('ascii')
-        body = unsafe_res.body.tobytes()
-
-        headers = [
-            (key.tobytes().decode('ascii'), value.tobytes().decode('ascii'))
-            for key, value in unsafe_res.headers
-        ]
-
-        return SafeHttpResponse(
-            status_code=unsafe_res.status_code,
-            status_message=status_message,
-            body=body,
-            headers=headers,
-            content_length=unsafe_res.content_length,
-        )
+        self.send_request(request)
+        return self.read_response_safe()
 
     def perform_request_unsafe(self, request: HttpRequest) -> UnsafeHttpResponse:
-        self._build_request_string(request)
-        self._transport.write(self._buffer)
+        self.send_request(request)
+        return self.read_response_unsafe()
+
+    def send_request(self, request: HttpRequest) -> None:
+        iov: list[bytes] = []
+        self._append_request_iov(request, iov)
+        self._transport.writev(iov)
+
+    def send_requests(self, requests: Iterable[HttpRequest]) -> None:
+        # Queue the whole batch back to back so it goes out in one writev.
+        iov: list[bytes] = []
+        for request in requests:
+            self._append_request_iov(request, iov)
+        self._transport.writev(iov)
+
+    def perform_requests_pipelined(self, requests: list[HttpRequest]) -> list[SafeHttpResponse]:
+        # One write for the whole batch, then the responses are consumed in
+        # order; bytes read past each one carry over to the next.
+        self.send_requests(requests)
+        return self.read_responses_safe(len(requests))
+
+    def read_response_safe(self) -> SafeHttpResponse:
+        self._read_full_response()
+        return self._parse_safe_response()
+
+    def read_responses_safe(self, count: int) -> list[SafeHttpResponse]:
+        # Responses that arrived together are parsed straight out of the
+        # buffer one after another; the transport is only read again once
+        # the bytes on hand run out.
+        read_full_response = self._read_full_response
+        parse_safe_response = self._parse_safe_response
+        responses = []
+        for _ in range(count):
+            read_full_response()
+            responses.append(parse_safe_response())
+        return responses
+
+    def read_response_unsafe(self) -> UnsafeHttpResponse:
         self._read_full_response()
         return self._parse_unsafe_response()
 
-    def _build_request_string(self, request: HttpRequest) -> None:
-        self._buffer = bytearray()
-
-        request_line = f"{request.method.value} {request.path} HTTP/1.1\r\n"
-        self._buffer += request_line.encode('ascii')
-
-        for key, value in request.headers:
-            header_line = f"{key}: {value}\r\n"
-            self._buffer += header_line.encode('ascii')
-
-        self._buffer += "\r\n".encode('ascii')
-
+    def _append_request_iov(self, request: HttpRequest, iov: list[bytes]) -> None:
+        # Clients tend to resend the same method, path and headers, so the
+        # whole serialized head is cached under them.
+        head_key = (request.method, request.path, *request.headers)
+        head = self._request_head_cache.get(head_key)
+        if head is None:
+            head = self._build_request_head(request)
+            self._cache_line(self._request_head_cache, head_key, head)
+        iov.append(head)
+
+        # The body goes to the kernel as its own entry so it is never copied here.
         if request.body and request.method == HttpMethod.POST:
-            self._buffer += request.body
+            iov.append(request.body)
+
+    def _build_request_head(self, request: HttpRequest) -> bytes:
+        parts: list[bytes] = []
+        # Request lines and header lines repeat across requests, so each is
+        # encoded once and then served from a small per-protocol cache.
+        line_key = (request.method, request.path)
+        request_line = self._request_line_cache.get(line_key)
+        if request_line is None:
+            request_line = self._METHOD_BYTES[request.method] + request.path.encode('ascii') + b" HTTP/1.1\r\n"
+            self._cache_line(self._request_line_cache, line_key, request_line)
+        parts.append(request_line)
+
+        header_line_cache = self._header_line_cache
+        for header in request.headers:
+            header_line = header_line_cache.get(header)
+            if header_line is None:
+                header_line = f"{header[0]}: {header[1]}\r\n".encode('ascii')
+                self._cache_line(header_line_cache, header, header_line)
+            parts.append(header_line)
+
+        parts.append(b"\r\n")
+        return b"".join(parts)
+
+    def _cache_line(self, cache: dict, key: tuple, line: bytes) -> None:
+        # Bound memory for clients that never repeat a path or header value.
+        if len(cache) >= self._MAX_CACHE_ENTRIES:
+            cache.clear()
+        cache[key] = line
 
     def _read_full_response(self) -> None:
-        self._buffer.clear()
+        # Start from whatever was read past the previous response; with
+        # pipelined requests that is the beginning of this one.
+        leftover = self._filled - self._response_end
+        if self._buffer_has_views():
+            # An unsafe response still holds views of this buffer, so read
+            # into another one rather than overwrite it.
+            self._swap_buffer(leftover)
+        elif leftover:
+            self._buffer[:leftover] = self._buffer[self._response_end:self._filled]
+        self._filled = leftover
+        self._response_end = 0
         self._header_size = 0
         self._content_length = None
         read_chunk_size = 4096
 
-        while True:
-            old_len = len(self._buffer)
+        if self._filled:
+            self._find_headers()
+
+        while not self._is_response_complete():
+            old_len = self._filled
+            if self._content_length is not None:
+                # The body size is known, so ask for the rest of it, but only
+                # a bounded step past the buffer at a time: the peer's
+                # Content-Length is not trusted with an allocation up front.
+                read_end = min(self._header_size + self._content_length,
+                               max(len(self._buffer), old_len + self._MAX_BODY_READ))
+            else:
+                # Otherwise offer all free space, but never less than one chunk.
+                read_end = max(len(self._buffer), old_len + read_chunk_size)
+
+            if read_end > len(self._buffer):
+                self._grow_buffer(read_end)
+
             try:
-                self._buffer.extend(b'\0' * read_chunk_size)
                 read_view = memoryview(self._buffer)
-                bytes_read = self._transport.read_into(read_view[old_len:])
+                if self._content_length is not None:
+                    # Wait in the kernel for the rest of the body rather than
+                    # waking up for every segment that arrives.
+                    bytes_read = self._transport.read_exact(read_view[old_len:read_end])
+                else:
+                    bytes_read = self._transport.read_into(read_view[old_len:read_end])
                 del read_view
-                del self._buffer[old_len + bytes_read:]
+                self._filled += bytes_read
 
                 if bytes_read == 0:
-                    if self._content_length is not None and len(self._buffer) < self._header_size + self._content_length:
+                    if self._content_length is not None and self._filled < self._header_size + self._content_length:
                         raise HttpParseError("Connection closed before full content length was received.")
                     break
 
             except ConnectionClosedError:
-                if self._content_length is not None and len(self._buffer) < self._header_size + self._content_length:
+                if self._content_length is not None and self._filled < self._header_size + self._content_length:
                     raise HttpParseError("Connection closed before full content length was received.")
                 break
 
             if self._header_size == 0:
-                separator_pos = self._buffer.find(self._HEADER_SEPARATOR)
-                if separator_pos != -1:
-                    self._header_size = separator_pos + len(self._HEADER_SEPARATOR)
+                # Earlier bytes were already scanned; back up only enough to
+                # catch a separator split across the previous read.
+                self._find_headers(max(0, old_len - len(self._HEADER_SEPARATOR) + 1))
 
-                    headers_block_lower = self._buffer[:self._header_size].lower()
-                    cl_key_pos = headers_block_lower.find(self._HEADER_SEPARATOR_CL.lower())
+        if self._header_size == 0 and self._filled:
+            raise HttpParseError("Could not find header separator in response.")
 
-                    if cl_key_pos != -1:
-                        line_end_pos = self._buffer.find(b'\r\n', cl_key_pos)
-                        if line_end_pos != -1:
-                            value_start_pos = cl_key_pos + len(self._HEADER_SEPARATOR_CL)
-                            value_slice = self._buffer[value_start_pos:line_end_pos]
+        # Anything past this point belongs to the next pipelined response.
+        if self._content_length is not None:
+            self._response_end = self._header_size + self._content_length
+        else:
+            self._response_end = self._filled
 
-                            try:
-                                self._content_length = int(value_slice.strip())
-                            except ValueError:
-                                raise HttpParseError("Invalid Content-Length value")
+    def _buffer_has_views(self) -> bool:
+        # A bytearray refuses to change size while any memoryview of it is
+        # alive, so a one-byte append tells whether an unsafe response the
+        # caller has neither dropped nor released still points into it.
+        try:
+            self._buffer.append(0)
+        except BufferError:
+            return True
+        self._buffer.pop()
+        return False
+
+    def _swap_buffer(self, leftover: int) -> None:
+        # Leave room to read after the carried-over bytes, or the very next
+        # read would have to grow and copy them a second time.
+        new_buffer = bytearray(max(self._INITIAL_BUFFER_SIZE, 2 * leftover))
+        new_buffer[:leftover] = memoryview(self._buffer)[self._response_end:self._filled]
+        self._buffer = new_buffer
+
+    def _grow_buffer(self, min_size: int) -> None:
+        # Copy into a new buffer rather than resizing in place, which fails
+        # while an earlier unsafe response still holds views of the old one.
+        new_buffer = bytearray(max(min_size, 2 * len(self._buffer)))
+        new_buffer[:self._filled] = memoryview(self._buffer)[:self._filled]
+        self._buffer = new_buffer
+
+    def _is_response_complete(self) -> bool:
+        if self._content_length is None:
+            return False
+        return self._filled >= self._header_size + self._content_length
+
+    def _find_headers(self, search_start: int = 0) -> None:
+        separator_pos = self._buffer.find(self._HEADER_SEPARATOR, search_start, self._filled)
+        if separator_pos == -1:
+            return
+
+        self._header_size = separator_pos + len(self._HEADER_SEPARATOR)
+
+        # Servers almost always send the canonical spelling, which a single
+        # find locates without copying; only other casings pay for lower().
+        cl_key_pos = self._buffer.find(self._HEADER_SEPARATOR_CL, 0, self._header_size)
+        if cl_key_pos == -1:
+            headers_block_lower = self._buffer[:self._header_size].lower()
+            cl_key_pos = headers_block_lower.find(self._HEADER_SEPARATOR_CL_LOWER)
+
+        if cl_key_pos != -1:
+            line_end_pos = self._buffer.find(b'\r\n', cl_key_pos)
+            if line_end_pos != -1:
+                value_start_pos = cl_key_pos + len(self._HEADER_SEPARATOR_CL_LOWER)
+
+                try:
+                    # int() already skips surrounding whitespace, and on a
+                    # bytearray slice it parses the digits directly; going
+                    # through a memoryview costs an extra view and bytes copy.
+                    self._content_length = int(self._buffer[value_start_pos:line_end_pos])
+                except ValueError:
+                    raise HttpParseError("Invalid Content-Length value")
+
+    def _parse_status_line(self, status_line: bytes) -> tuple[int, int]:
+        # One split yields version, code and message; the message offset
+        # follows from the lengths of the first two fields.
+        status_parts = status_line.split(b' ', 2)
+        if len(status_parts) < 2:
+            raise HttpParseError("Could not find space after HTTP version.")
+        if len(status_parts) < 3:
+            raise HttpParseError("Could not find space after status code.")
 
-            if self._content_length is not None:
-                if len(self._buffer) >= self._header_size + self._content_length:
-                    break
+        # Every valid code is one of a few hundred three-digit strings, so a
+        # table lookup replaces the general integer parser.
+        status_code = self._STATUS_CODES.get(status_parts[1])
+        if status_code is None:
+            try:
+                status_code = int(status_parts[1])
+            except ValueError:
+                raise HttpParseError("Invalid status code in status line.")
 
-        if self._header_size == 0 and self._buffer:
-            raise HttpParseError("Could not find header separator in response.")
+        return status_code, len(status_parts[0]) + len(status_parts[1]) + 2
+
+    def _parse_safe_response(self) -> SafeHttpResponse:
+        if self._header_size == 0:
+            raise HttpParseError("Cannot parse response with no headers.")
+
+        buffer_view = memoryview(self._buffer)
+
+        status_line_end = self._buffer.find(b'\r\n', 0, self._header_size)
+        status_line = bytes(buffer_view[:status_line_end])
+        status_code, message_start = self._parse_status_line(status_line)
+
+        # The caller gets owned strings anyway, so decode the header fields
+        # in one pass and split the resulting str; each key and value is then
+        # the only copy made of it.
+        header_block = self._buffer[status_line_end + 2:self._header_size - 4].decode('ascii')
+        headers = [
+            (key, value.lstrip(' \t'))
+            for key, colon, value in (line.partition(':') for line in header_block.split('\r\n'))
+            if colon
+        ]
+
+        if self._content_length is not None:
+            body = bytes(buffer_view[self._header_size:self._header_size + self._content_length])
+        else:
+            body = bytes(buffer_view[self._header_size:self._filled])
+
+        return SafeHttpResponse(
+            status_code=status_code,
+            status_message=status_line[message_start:].decode('ascii'),
+            body=body,
+            headers=headers,
+            content_length=self._content_length,
+        )
 
     def _parse_unsafe_response(self) -> UnsafeHttpResponse:
         if self._header_size == 0:
@@ -120,51 +312,31 @@ class Http1Protocol(HttpProtocol):
         if status_line_end == -1:
             raise HttpParseError("Could not find status line terminator.")
 
-        first_space = self._buffer.find(b' ', 0, status_line_end)
-        if first_space == -1:
-            raise HttpParseError("Could not find space after HTTP version.")
-
-        second_space = self._buffer.find(b' ', first_space + 1, status_line_end)
-        if second_space == -1:
-            raise HttpParseError("Could not find space after status code.")
-
-        try:
-            status_code = int(buffer_view[first_space + 1:second_space])
-        except ValueError:
-            raise HttpParseError("Invalid status code in status line.")
-
-        status_message = buffer_view[second_space + 1:status_line_end]
+        status_code, message_start = self._parse_status_line(bytes(buffer_view[:status_line_end]))
+        status_message = buffer_view[message_start:status_line_end]
 
+        # Split the header block in one C call and map each line back to
+        # buffer offsets so keys and values stay zero-copy views.
         headers = []
         current_pos = status_line_end + 2
-        while current_pos < self._header_size:
-            line_end = self._buffer.find(b'\r\n', current_pos, self._header_size)
-            if line_end == -1:
-                break
-
-            if line_end == current_pos:
-                break
-
-            header_line_view = buffer_view[current_pos:line_end]
-            colon_pos = self._buffer.find(b':', current_pos, line_end)
+        header_block = bytes(buffer_view[current_pos:self._header_size - 4])
+        for line in header_block.split(b'\r\n') if header_block else ():
+            colon_pos = line.find(b':')
 
             if colon_pos != -1:
-                key = buffer_view[current_pos:colon_pos]
-
-                value_start = colon_pos + 1
-                while value_start < line_end and self._buffer[value_start] in (32, 9):
-                    value_start += 1
+                key = buffer_view[current_pos:current_pos + colon_pos]
 
-                value = buffer_view[value_start:line_end]
+                value_start = current_pos + len(line) - len(line[colon_pos + 1:].lstrip(b' \t'))
+                value = buffer_view[value_start:current_pos + len(line)]
                 headers.append((key, value))
 
-            current_pos = line_end + 2
+            current_pos += len(line) + 2
 
         if self._content_length is not None:
             body_end = self._header_size + self._content_length
             body = buffer_view[self._header_size:body_end]
         else:
-            body = buffer_view[self._header_size:]
+            body = buffer_view[self._header_size:self._filled]
 
         return UnsafeHttpResponse(
             status_code=status_code,
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
+from collections.abc import Iterable
 from typing import Protocol
 
 class HttpMethod(Enum):
@@ -29,6 +30,15 @@ class UnsafeHttpResponse:
     headers: list[tuple[memoryview, memoryview]]
     content_length: int | None = None
 
+    def release(self) -> None:
+        # The views keep the protocol from reusing their buffer; once they are
+        # released, or the response is dropped, the next read reuses it.
+        self.status_message.release()
+        self.body.release()
+        for key, value in self.headers:
+            key.release()
+            value.release()
+
 class HttpProtocol(Protocol):
     def connect(self, host: str, port: int) -> None:
         ...
@@ -42,6 +52,24 @@ class HttpProtocol(Protocol):
     def perform_request_unsafe(self, request: HttpRequest) -> UnsafeHttpResponse:
         ...
 
+    def perform_requests_pipelined(self, requests: list[HttpRequest]) -> list[SafeHttpResponse]:
+        ...
+
+    def send_request(self, request: HttpRequest) -> None:
+        ...
+
+    def send_requests(self, requests: Iterable[HttpRequest]) -> None:
+        ...
+
+    def read_response_safe(self) -> SafeHttpResponse:
+        ...
+
+    def read_responses_safe(self, count: int) -> list[SafeHttpResponse]:
+        ...
+
+    def read_response_unsafe(self) -> UnsafeHttpResponse:
+        ...
+
 class HttpStatusCode(Enum):
     CONTINUE = 100
     OK = 200
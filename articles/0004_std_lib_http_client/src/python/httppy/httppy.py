@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 from .errors import InvalidRequestError
 from .http_protocol import (
     HttpProtocol,
@@ -37,6 +39,35 @@ class HttpClient:
         request.method = HttpMethod.POST
         return self._protocol.perform_request_unsafe(request)
 
+    def perform_pipelined(self, requests: list[HttpRequest]) -> list[SafeHttpResponse]:
+        for request in requests:
+            self._validate_request(request)
+        return self._protocol.perform_requests_pipelined(requests)
+
+    def send_request(self, request: HttpRequest) -> None:
+        self._validate_request(request)
+        self._protocol.send_request(request)
+
+    def send_requests(self, requests: Sequence[HttpRequest]) -> None:
+        for request in requests:
+            self._validate_request(request)
+        self._protocol.send_requests(requests)
+
+    def recv_response_safe(self) -> SafeHttpResponse:
+        return self._protocol.read_response_safe()
+
+    def recv_responses_safe(self, count: int) -> list[SafeHttpResponse]:
+        return self._protocol.read_responses_safe(count)
+
+    def recv_response_unsafe(self) -> UnsafeHttpResponse:
+        return self._protocol.read_response_unsafe()
+
+    def _validate_request(self, request: HttpRequest) -> None:
+        if request.method == HttpMethod.POST:
+            self._validate_post_request(request)
+        else:
+            self._validate_get_request(request)
+
     def _validate_get_request(self, request: HttpRequest) -> None:
         if request.body:
             raise InvalidRequestError("GET requests cannot have a body.")
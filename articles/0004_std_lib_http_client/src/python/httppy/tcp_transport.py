@@ -1,4 +1,5 @@
 import socket
+from collections.abc import Sequence
 
 from .errors import (
     TransportError,
@@ -7,10 +8,14 @@ from .errors import (
     SocketWriteError,
     SocketReadError,
 )
-from .transport import Transport
+from .transport import Transport, sendmsg_all
 
 
 class TcpTransport(Transport):
+    _SOCKET_BUFFER_SIZE = 1 << 20
+    # Linux only; elsewhere writes that need several calls are left uncorked.
+    _TCP_CORK = getattr(socket, "TCP_CORK", None)
+
     def __init__(self) -> None:
         self._sock: socket.socket | None = None
 
@@ -20,6 +25,10 @@ class TcpTransport(Transport):
 
         try:
             self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Size the kernel buffers before connecting so the receive window
+            # scale negotiated in the handshake can make use of them.
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._SOCKET_BUFFER_SIZE)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._SOCKET_BUFFER_SIZE)
             self._sock.connect((host, port))
             self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         except socket.gaierror as e:
@@ -38,6 +47,15 @@ class TcpTransport(Transport):
         except OSError as e:
             raise SocketWriteError(f"Socket write failed: {e}") from e
 
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        if self._sock is None:
+            raise TransportError("Cannot write on a disconnected transport.")
+
+        try:
+            return sendmsg_all(self._sock, buffers, self._TCP_CORK)
+        except OSError as e:
+            raise SocketWriteError(f"Socket write failed: {e}") from e
+
     def read_into(self, buffer: bytearray) -> int:
         if self._sock is None:
             raise TransportError("Cannot read from a disconnected transport.")
@@ -47,6 +65,17 @@ class TcpTransport(Transport):
         except OSError as e:
             raise SocketReadError(f"Socket read failed: {e}") from e
 
+    def read_exact(self, buffer: memoryview) -> int:
+        if self._sock is None:
+            raise TransportError("Cannot read from a disconnected transport.")
+
+        try:
+            # MSG_WAITALL lets the kernel fill the whole buffer before waking
+            # us; it returns short only on EOF, a signal or an error.
+            return self._sock.recv_into(buffer, len(buffer), socket.MSG_WAITALL)
+        except OSError as e:
+            raise SocketReadError(f"Socket read failed: {e}") from e
+
     def close(self) -> None:
         if self._sock is not None:
             try:
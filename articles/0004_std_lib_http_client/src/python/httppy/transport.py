@@ -1,5 +1,10 @@
+import socket
+from collections.abc import Sequence
 from typing import Protocol
 
+# sendmsg() rejects more buffers than the kernel's IOV_MAX in one call.
+_IOV_MAX = 1024
+
 class Transport(Protocol):
     def connect(self, host: str, port: int) -> None:
         ...
@@ -7,8 +12,56 @@ class Transport(Protocol):
     def write(self, data: bytes) -> int:
         ...
 
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        # Fallback for transports without scatter-gather writes.
+        return self.write(b"".join(buffers))
+
     def read_into(self, buffer: bytearray) -> int:
         ...
 
+    def read_exact(self, buffer: memoryview) -> int:
+        # Fallback for transports that cannot wait for a full buffer; stops
+        # short only when the peer closes.
+        filled = 0
+        while filled < len(buffer):
+            bytes_read = self.read_into(buffer[filled:])
+            if bytes_read == 0:
+                break
+            filled += bytes_read
+        return filled
+
     def close(self) -> None:
-        ...
\ No newline at end of file
+        ...
+
+
+def sendmsg_all(sock: socket.socket, buffers: Sequence[bytes], cork: int | None = None) -> int:
+    # Writes every buffer with as few sendmsg() calls as the kernel allows.
+    # Given a cork option (TCP_CORK), the socket is corked once a write comes
+    # up short so the remainder is not flushed as small segments.
+    pending = list(buffers)
+    total = 0
+    corked = False
+    try:
+        while pending:
+            sent = sock.sendmsg(pending[:_IOV_MAX])
+            total += sent
+            # Drop the buffers the kernel took whole and resume mid-way
+            # through the one a short write cut off.
+            index = 0
+            while index < len(pending) and sent >= len(pending[index]):
+                sent -= len(pending[index])
+                index += 1
+            del pending[:index]
+            if sent:
+                pending[0] = memoryview(pending[0])[sent:]
+            if pending and not corked and cork is not None:
+                # With TCP_NODELAY every call flushes, so cork while the
+                # rest is queued to keep the tail from going out as runts.
+                sock.setsockopt(socket.IPPROTO_TCP, cork, 1)
+                corked = True
+    finally:
+        # Uncork even when a send fails, or the next request would sit in
+        # the kernel behind the cork.
+        if corked:
+            sock.setsockopt(socket.IPPROTO_TCP, cork, 0)
+    return total
@@ -1,10 +1,13 @@
 import socket
+from collections.abc import Sequence
 
 from .errors import TransportError, SocketConnectError, SocketWriteError, SocketReadError
-from .transport import Transport
+from .transport import Transport, sendmsg_all
 
 
 class UnixTransport(Transport):
+    _SOCKET_BUFFER_SIZE = 1 << 20
+
     def __init__(self) -> None:
         self._sock: socket.socket | None = None
 
@@ -17,6 +20,8 @@ class UnixTransport(Transport):
 
         try:
             self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._SOCKET_BUFFER_SIZE)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._SOCKET_BUFFER_SIZE)
             self._sock.connect(path)
         except OSError as e:
             self._sock = None
@@ -31,6 +36,15 @@ class UnixTransport(Transport):
         except OSError as e:
             raise SocketWriteError(f"Socket write failed: {e}") from e
 
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        if self._sock is None:
+            raise TransportError("Cannot write on a disconnected transport.")
+
+        try:
+            return sendmsg_all(self._sock, buffers)
+        except OSError as e:
+            raise SocketWriteError(f"Socket write failed: {e}") from e
+
     def read_into(self, buffer: bytearray) -> int:
         if self._sock is None:
             raise TransportError("Cannot read from a disconnected transport.")
@@ -40,6 +54,17 @@ class UnixTransport(Transport):
         except OSError as e:
             raise SocketReadError(f"Socket read failed: {e}") from e
 
+    def read_exact(self, buffer: memoryview) -> int:
+        if self._sock is None:
+            raise TransportError("Cannot read from a disconnected transport.")
+
+        try:
+            # MSG_WAITALL lets the kernel fill the whole buffer before waking
+            # us; it returns short only on EOF, a signal or an error.
+            return self._sock.recv_into(buffer, len(buffer), socket.MSG_WAITALL)
+        except OSError as e:
+            raise SocketReadError(f"Socket read failed: {e}") from e
+
     def close(self) -> None:
         if self._sock is not None:
             try:
@@ -0,0 +1,211 @@
+import pytest
+import socket
+import threading
+import time
+import os
+import select
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Generator, Type
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+
+from httppy.transport import Transport
+from httppy.tcp_transport import TcpTransport
+from httppy.unix_transport import UnixTransport
+
+
+@dataclass
+class ServerDetails:
+    host: str = ""
+    port: int = 0
+    path: str = ""
+
+
+# Hands the single request a handler captured over to the test thread.
+class RequestSlot:
+    def __init__(self):
+        self._data = b""
+        self._filled = threading.Event()
+
+    def put(self, data: bytes):
+        self._data = data
+        self._filled.set()
+
+    def get(self, timeout: float) -> bytes:
+        assert self._filled.wait(timeout), "handler never captured a request"
+        return self._data
+
+
+# One listener per transport for the whole session; each request is served on
+# a small thread pool by whichever handler the current test set. Connections
+# accepted outside a test, such as pooled ones, wait idle for their first
+# request, and after a keep-alive test they go back to waiting instead of
+# being closed.
+class ReusableServer:
+    def __init__(self, transport_class: Type[Transport]):
+        self.details = ServerDetails()
+        if transport_class is TcpTransport:
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._listener.bind(("127.0.0.1", 0))
+            self.details.host, self.details.port = self._listener.getsockname()
+        elif transport_class is UnixTransport:
+            self.details.path = f"/tmp/httppy_test_{os.getpid()}_{time.time_ns()}.sock"
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(self.details.path)
+        else:
+            pytest.fail(f"Unknown transport type for server_factory: {transport_class}")
+
+        self._listener.listen()
+        self._handler: Callable[[socket.socket], None] | None = None
+        self._keep_alive = False
+        self._closing = False
+        self._lock = threading.Lock()
+        self._idle: list[socket.socket] = []
+        self._pending: list[Future] = []
+        self._served = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        # Writing to the socket pair wakes the accept loop so it picks up
+        # connections returned to the idle set, or exits at teardown.
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._accept_thread = threading.Thread(target=self._accept_loop)
+        self._accept_thread.start()
+
+    def _accept_loop(self):
+        while True:
+            with self._lock:
+                idle = list(self._idle)
+            readable, _, _ = select.select([self._listener, self._wake_reader, *idle], [], [])
+            for sock in readable:
+                if sock is self._wake_reader:
+                    self._wake_reader.recv(64)
+                    if self._closing:
+                        with self._lock:
+                            idle, self._idle = self._idle, []
+                        for idle_sock in idle:
+                            idle_sock.close()
+                        return
+                elif sock is self._listener:
+                    try:
+                        client_sock, _ = self._listener.accept()
+                    except OSError:
+                        continue
+                    if client_sock.family == socket.AF_INET:
+                        # Match the client side so small replies are not held back by Nagle.
+                        client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self._dispatch(client_sock)
+                else:
+                    with self._lock:
+                        self._idle.remove(sock)
+                    try:
+                        has_request = bool(sock.recv(1, socket.MSG_PEEK))
+                    except OSError:
+                        has_request = False
+                    if has_request:
+                        self._dispatch(sock)
+                    else:
+                        sock.close()
+
+    def _dispatch(self, client_sock: socket.socket):
+        # Runs on the accept thread; the test thread swaps the handler and
+        # collects _pending, so both sides touch it under the lock.
+        with self._lock:
+            handler = self._handler
+            if handler is None:
+                self._idle.append(client_sock)
+            else:
+                self._pending.append(self._executor.submit(self._serve, handler, self._keep_alive, client_sock))
+
+    def _serve(self, handler: Callable[[socket.socket], None], keep_alive: bool, client_sock: socket.socket):
+        try:
+            handler(client_sock)
+        except OSError:
+            keep_alive = False
+
+        if keep_alive:
+            with self._lock:
+                self._idle.append(client_sock)
+            self._wake_writer.send(b"\0")
+        else:
+            client_sock.close()
+        self._served.set()
+
+    @contextmanager
+    def serve(self, handler: Callable[[socket.socket], None], keep_alive: bool) -> Generator[ServerDetails, None, None]:
+        with self._lock:
+            self._handler = handler
+            self._keep_alive = keep_alive
+        self._served.clear()
+        try:
+            yield self.details
+        finally:
+            with self._lock:
+                self._handler = None
+                self._keep_alive = False
+                pending, self._pending = self._pending, []
+            # Let this test's requests finish before the next test starts; a
+            # handler still running now would answer the next test's requests.
+            _, not_done = wait(pending, timeout=1.0)
+            assert not not_done, f"{len(not_done)} handler(s) still running after the test"
+
+    def serve_next(self, handler: Callable[[socket.socket], None]) -> None:
+        # Swaps the handler inside a serve() block, for tests that build it
+        # after their fixtures are set up.
+        with self._lock:
+            self._handler = handler
+
+    def wait_until_served(self, timeout: float = 1.0) -> bool:
+        return self._served.wait(timeout)
+
+    def close(self):
+        self._closing = True
+        self._wake_writer.send(b"\0")
+        self._accept_thread.join()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._listener.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+        if self.details.path and os.path.exists(self.details.path):
+            os.remove(self.details.path)
+
+
+class SharedServers:
+    def __init__(self):
+        self._servers: dict[Type[Transport], ReusableServer] = {}
+
+    def __call__(self, transport_class: Type[Transport], handler: Callable[[socket.socket], None],
+                 keep_alive: bool = False) -> ContextManager[ServerDetails]:
+        return self.get(transport_class).serve(handler, keep_alive)
+
+    def get(self, transport_class: Type[Transport]) -> ReusableServer:
+        if transport_class not in self._servers:
+            self._servers[transport_class] = ReusableServer(transport_class)
+        return self._servers[transport_class]
+
+    def close(self):
+        for server in self._servers.values():
+            server.close()
+
+
+@pytest.fixture
+def request_slot() -> RequestSlot:
+    return RequestSlot()
+
+
+@pytest.fixture(scope="session")
+def server_factory() -> Generator[SharedServers, None, None]:
+    servers = SharedServers()
+    yield servers
+    servers.close()
+
+
+# Transport tests connect once and hand the connection to the handler given
+# through indirect parametrization, or to serve_next() before connecting.
+# Each transport module supplies the transport_class fixture.
+@pytest.fixture
+def test_server(request, server_factory, transport_class) -> Generator[ReusableServer, None, None]:
+    server = server_factory.get(transport_class)
+    with server.serve(request.param if hasattr(request, "param") else None, keep_alive=False):
+        yield server
+        server.wait_until_served()
@@ -1,12 +1,9 @@
 import pytest
 import socket
 import threading
-import time
-import os
-from dataclasses import dataclass
-from typing import Callable, Generator, Type
-from contextlib import contextmanager
-from queue import Queue
+from typing import Generator, Type
+from queue import Empty, Full, Queue
+from unittest.mock import patch
 
 
 from httppy.transport import Transport
@@ -17,69 +14,36 @@ from httppy.http_protocol import HttpRequest, HttpMethod
 from httppy.errors import TransportError, HttpParseError
 
 
-@dataclass
-class ServerDetails:
-    host: str = ""
-    port: int = 0
-    path: str = ""
+@pytest.fixture(scope="session")
+def protocol_pool(server_factory) -> Generator[dict[Type[Transport], Queue], None, None]:
+    pools: dict[Type[Transport], Queue] = {TcpTransport: Queue(maxsize=4), UnixTransport: Queue(maxsize=4)}
+    yield pools
+    for pool in pools.values():
+        while not pool.empty():
+            pool.get_nowait().disconnect()
 
 
 @pytest.fixture
-def server_factory() -> Callable[[Type[Transport], Callable[[socket.socket], None]], Generator[ServerDetails, None, None]]:
-    @contextmanager
-    def _factory(transport_class: Type[Transport], handler: Callable[[socket.socket], None]):
-        server_thread = None
-        listener_sock = None
-        details = ServerDetails()
-        stop_event = threading.Event()
-
-        def server_loop(listener: socket.socket):
-            try:
-                client_sock, _ = listener.accept()
-                with client_sock:
-                    handler(client_sock)
-            except (socket.timeout, OSError):
-                pass
-
+def pooled_protocol(server_factory, protocol_pool, transport_class) -> Generator[Http1Protocol, None, None]:
+    # Keep-alive tests check a connected protocol out of the pool and hand it
+    # back afterwards, so the same connection serves test after test.
+    pool = protocol_pool[transport_class]
+    try:
+        protocol = pool.get_nowait()
+    except Empty:
+        details = server_factory.get(transport_class).details
+        protocol = Http1Protocol(transport_class())
         if transport_class is TcpTransport:
-            listener_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            listener_sock.bind(("127.0.0.1", 0))
-            details.host, details.port = listener_sock.getsockname()
-        elif transport_class is UnixTransport:
-            details.path = f"/tmp/httppy_test_{os.getpid()}_{time.time_ns()}.sock"
-            if os.path.exists(details.path):
-                os.remove(details.path)
-            listener_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            listener_sock.bind(details.path)
+            protocol.connect(details.host, details.port)
         else:
-            pytest.fail(f"Unknown transport type for server_factory: {transport_class}")
-
-        try:
-            listener_sock.settimeout(1.0)
-            listener_sock.listen()
-            server_thread = threading.Thread(target=server_loop, args=(listener_sock,))
-            server_thread.start()
-            yield details
-        finally:
-            stop_event.set()
-            if transport_class is TcpTransport:
-                with socket.create_connection((details.host, details.port), timeout=0.1):
-                    pass
-            elif transport_class is UnixTransport:
-                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
-                    try:
-                        sock.connect(details.path)
-                    except (ConnectionRefusedError, FileNotFoundError):
-                        pass
+            protocol.connect(details.path, 0)
 
-            if server_thread:
-                server_thread.join(timeout=1.0)
-            if listener_sock:
-                listener_sock.close()
-            if transport_class is UnixTransport and os.path.exists(details.path):
-                os.remove(details.path)
+    yield protocol
 
-    return _factory
+    try:
+        pool.put_nowait(protocol)
+    except Full:
+        protocol.disconnect()
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
@@ -112,12 +76,11 @@ def test_perform_request_fails_if_not_connected(transport_class):
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_correctly_serializes_get_request(server_factory, transport_class):
-    request_queue = Queue()
+def test_correctly_serializes_get_request(server_factory, transport_class, request_slot):
 
     def handler(client_sock: socket.socket):
         data = client_sock.recv(1024)
-        request_queue.put(data)
+        request_slot.put(data)
         client_sock.sendall(b"HTTP/1.1 204 No Content\r\n\r\n")
 
     with server_factory(transport_class, handler) as details:
@@ -138,7 +101,7 @@ def test_correctly_serializes_get_request(server_factory, transport_class):
         protocol.perform_request_unsafe(req)
         protocol.disconnect()
 
-    captured_request = request_queue.get(timeout=1.0)
+    captured_request = request_slot.get(timeout=1.0)
     expected_request = (
         b"GET /test HTTP/1.1\r\n"
         b"Host: example.com\r\n"
@@ -149,23 +112,16 @@ def test_correctly_serializes_get_request(server_factory, transport_class):
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_correctly_serializes_post_request(server_factory, transport_class):
-    request_queue = Queue()
+def test_correctly_serializes_post_request(server_factory, pooled_protocol, transport_class, request_slot):
     body_content = b"key=value&data=true"
 
     def handler(client_sock: socket.socket):
         data = client_sock.recv(1024)
-        request_queue.put(data)
+        request_slot.put(data)
         client_sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
 
-    with server_factory(transport_class, handler) as details:
-        transport = transport_class()
-        protocol = Http1Protocol(transport)
-
-        if transport_class is TcpTransport:
-            protocol.connect(details.host, details.port)
-        else:
-            protocol.connect(details.path, 0)
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
 
         req = HttpRequest(
             method=HttpMethod.POST,
@@ -178,9 +134,8 @@ def test_correctly_serializes_post_request(server_factory, transport_class):
         )
 
         protocol.perform_request_unsafe(req)
-        protocol.disconnect()
 
-    captured_request = request_queue.get(timeout=1.0)
+    captured_request = request_slot.get(timeout=1.0)
     expected_request = (
         b"POST /api/submit HTTP/1.1\r\n"
         b"Host: test-server\r\n"
@@ -193,7 +148,7 @@ def test_correctly_serializes_post_request(server_factory, transport_class):
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_parses_response_with_content_length(server_factory, transport_class):
+def test_parses_response_with_content_length(server_factory, pooled_protocol, transport_class):
     canned_response = (
         b"HTTP/1.1 200 OK\r\n"
         b"Content-Length: 12\r\n"
@@ -206,14 +161,8 @@ def test_parses_response_with_content_length(server_factory, transport_class):
         client_sock.recv(1024)
         client_sock.sendall(canned_response)
 
-    with server_factory(transport_class, handler) as details:
-        transport = transport_class()
-        protocol = Http1Protocol(transport)
-
-        if transport_class is TcpTransport:
-            protocol.connect(details.host, details.port)
-        else:
-            protocol.connect(details.path, 0)
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
 
         req = HttpRequest()
         res = protocol.perform_request_unsafe(req)
@@ -227,8 +176,6 @@ def test_parses_response_with_content_length(server_factory, transport_class):
         assert res.headers[1][1].tobytes() == b"text/plain"
         assert res.body.tobytes() == b"Hello Client"
 
-        protocol.disconnect()
-
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
 def test_reads_body_on_connection_close(server_factory, transport_class):
     canned_response = (
@@ -261,7 +208,7 @@ def test_reads_body_on_connection_close(server_factory, transport_class):
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_handles_response_split_across_multiple_reads(server_factory, transport_class):
+def test_handles_response_split_across_multiple_reads(server_factory, pooled_protocol, transport_class):
     response_chunks = [
         b"HTTP/1.1 200 OK\r\n",
         b"Content-Type: text/plain\r\n",
@@ -270,23 +217,32 @@ def test_handles_response_split_across_multiple_reads(server_factory, transport_
         b"Body"
     ]
 
+    chunk_read = threading.Event()
+
     def handler(client_sock: socket.socket):
         client_sock.recv(1024)
-        for chunk in response_chunks:
+        for index, chunk in enumerate(response_chunks):
+            if index:
+                # Send each chunk only after the client has read the previous
+                # one, so every chunk arrives in a read of its own.
+                chunk_read.wait(1.0)
+                chunk_read.clear()
             client_sock.sendall(chunk)
-            time.sleep(0.01)
 
-    with server_factory(transport_class, handler) as details:
-        transport = transport_class()
-        protocol = Http1Protocol(transport)
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
+        read_into = protocol._transport.read_into
 
-        if transport_class is TcpTransport:
-            protocol.connect(details.host, details.port)
-        else:
-            protocol.connect(details.path, 0)
+        def signalling_read_into(buffer):
+            bytes_read = read_into(buffer)
+            chunk_read.set()
+            return bytes_read
 
         req = HttpRequest()
-        res = protocol.perform_request_unsafe(req)
+        with patch.object(protocol._transport, "read_into", side_effect=signalling_read_into) as mock_read_into:
+            res = protocol.perform_request_unsafe(req)
+
+        assert mock_read_into.call_count == 4
 
         assert res.status_code == 200
         assert len(res.headers) == 2
@@ -294,11 +250,9 @@ def test_handles_response_split_across_multiple_reads(server_factory, transport_
         assert res.headers[1][1].tobytes() == b"4"
         assert res.body.tobytes() == b"Body"
 
-        protocol.disconnect()
-
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_parses_complex_status_line_and_headers(server_factory, transport_class):
+def test_parses_complex_status_line_and_headers(server_factory, pooled_protocol, transport_class):
     canned_response = (
         b"HTTP/1.1 404 Not Found\r\n"
         b"Connection: close\r\n"
@@ -312,14 +266,8 @@ def test_parses_complex_status_line_and_headers(server_factory, transport_class)
         client_sock.recv(1024)
         client_sock.sendall(canned_response)
 
-    with server_factory(transport_class, handler) as details:
-        transport = transport_class()
-        protocol = Http1Protocol(transport)
-
-        if transport_class is TcpTransport:
-            protocol.connect(details.host, details.port)
-        else:
-            protocol.connect(details.path, 0)
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
 
         req = HttpRequest()
         res = protocol.perform_request_unsafe(req)
@@ -337,11 +285,9 @@ def test_parses_complex_status_line_and_headers(server_factory, transport_class)
         assert res.headers[3][1].tobytes() == b"0"
         assert res.body.tobytes() == b""
 
-        protocol.disconnect()
-
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_handles_zero_content_length_response(server_factory, transport_class):
+def test_handles_zero_content_length_response(server_factory, pooled_protocol, transport_class):
     canned_response = (
         b"HTTP/1.1 204 No Content\r\n"
         b"Content-Length: 0\r\n"
@@ -352,14 +298,8 @@ def test_handles_zero_content_length_response(server_factory, transport_class):
         client_sock.recv(1024)
         client_sock.sendall(canned_response)
 
-    with server_factory(transport_class, handler) as details:
-        transport = transport_class()
-        protocol = Http1Protocol(transport)
-
-        if transport_class is TcpTransport:
-            protocol.connect(details.host, details.port)
-        else:
-            protocol.connect(details.path, 0)
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
 
         req = HttpRequest()
         res = protocol.perform_request_unsafe(req)
@@ -370,12 +310,12 @@ def test_handles_zero_content_length_response(server_factory, transport_class):
         assert res.headers[0][1].tobytes() == b"0"
         assert res.body.tobytes() == b""
 
-        protocol.disconnect()
-
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_handles_response_larger_than_initial_buffer(server_factory, transport_class):
-    large_body = b'a' * 5000
+def test_handles_response_larger_than_initial_buffer(server_factory, pooled_protocol, transport_class):
+    # Twice the current buffer, so reading the body has to grow it.
+    buffer_size = len(pooled_protocol._buffer)
+    large_body = b'a' * (2 * buffer_size)
 
     canned_response = (
                               b"HTTP/1.1 200 OK\r\n"
@@ -387,6 +327,31 @@ def test_handles_response_larger_than_initial_buffer(server_factory, transport_c
         client_sock.recv(4096)
         client_sock.sendall(canned_response)
 
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
+
+        req = HttpRequest()
+        res = protocol.perform_request_unsafe(req)
+
+        assert res.status_code == 200
+        assert len(res.body) == len(large_body)
+        assert res.body.tobytes() == large_body
+        assert len(protocol._buffer) > buffer_size
+
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_fails_on_bad_content_length(server_factory, transport_class):
+    canned_response = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Length: 100\r\n"
+        b"\r\n"
+        b"short body"
+    )
+
+    def handler(client_sock: socket.socket):
+        client_sock.recv(1024)
+        client_sock.sendall(canned_response)
+
     with server_factory(transport_class, handler) as details:
         transport = transport_class()
         protocol = Http1Protocol(transport)
@@ -397,20 +362,20 @@ def test_handles_response_larger_than_initial_buffer(server_factory, transport_c
             protocol.connect(details.path, 0)
 
         req = HttpRequest()
-        res = protocol.perform_request_unsafe(req)
 
-        assert res.status_code == 200
-        assert len(res.body) == len(large_body)
-        assert res.body.tobytes() == large_body
+        with pytest.raises(HttpParseError, match="Connection closed before full content length"):
+            protocol.perform_request_unsafe(req)
 
         protocol.disconnect()
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_fails_on_bad_content_length(server_factory, transport_class):
+def test_fails_on_oversized_content_length(server_factory, transport_class):
+    # Far more than could ever be allocated; the short body must still end in
+    # a parse error rather than an attempt to size the buffer for it.
     canned_response = (
         b"HTTP/1.1 200 OK\r\n"
-        b"Content-Length: 100\r\n"
+        b"Content-Length: 99999999999999\r\n"
         b"\r\n"
         b"short body"
     )
@@ -428,10 +393,8 @@ def test_fails_on_bad_content_length(server_factory, transport_class):
         else:
             protocol.connect(details.path, 0)
 
-        req = HttpRequest()
-
         with pytest.raises(HttpParseError, match="Connection closed before full content length"):
-            protocol.perform_request_unsafe(req)
+            protocol.perform_request_safe(HttpRequest())
 
         protocol.disconnect()
 
@@ -494,4 +457,194 @@ def test_safe_request_returns_owning_deep_copy(server_factory, transport_class):
 
         assert res.body == b"Safe Buffer"
 
-        protocol.disconnect()
\ No newline at end of file
+        protocol.disconnect()
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_reads_pipelined_responses_in_order(server_factory, transport_class):
+    canned_responses = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst"
+        b"HTTP/1.1 201 Created\r\nContent-Length: 6\r\n\r\nsecond"
+    )
+
+    def handler(client_sock: socket.socket):
+        received = b""
+        while received.count(b"\r\n\r\n") < 2:
+            received += client_sock.recv(1024)
+        client_sock.sendall(canned_responses)
+
+    with server_factory(transport_class, handler) as details:
+        transport = transport_class()
+        protocol = Http1Protocol(transport)
+
+        if transport_class is TcpTransport:
+            protocol.connect(details.host, details.port)
+        else:
+            protocol.connect(details.path, 0)
+
+        protocol.send_request(HttpRequest(path="/first"))
+        protocol.send_request(HttpRequest(path="/second"))
+
+        first = protocol.read_response_unsafe()
+        second = protocol.read_response_safe()
+
+        assert first.status_code == 200
+        assert first.body.tobytes() == b"first"
+        assert second.status_code == 201
+        assert second.body == b"second"
+
+        protocol.disconnect()
+
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_parses_pipelined_responses_from_single_read(server_factory, pooled_protocol, transport_class):
+    canned_responses = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst"
+        b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n"
+        b"HTTP/1.1 201 Created\r\nContent-Length: 5\r\n\r\nthird"
+    )
+
+    def handler(client_sock: socket.socket):
+        received = b""
+        while received.count(b"\r\n\r\n") < 3:
+            received += client_sock.recv(1024)
+        client_sock.sendall(canned_responses)
+
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
+        protocol.send_requests([HttpRequest(path="/1"), HttpRequest(path="/2"), HttpRequest(path="/3")])
+
+        with patch.object(protocol._transport, "read_into", wraps=protocol._transport.read_into) as mock_read_into:
+            responses = protocol.read_responses_safe(3)
+
+        assert mock_read_into.call_count == 1
+        assert [res.status_code for res in responses] == [200, 404, 201]
+        assert [res.body for res in responses] == [b"first", b"", b"third"]
+
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_send_requests_writes_batch_in_order(server_factory, transport_class, request_slot):
+    canned_response = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+    def handler(client_sock: socket.socket):
+        received = b""
+        while not received.endswith(b"world"):
+            received += client_sock.recv(1024)
+        request_slot.put(received)
+        client_sock.sendall(canned_response * 2)
+
+    with server_factory(transport_class, handler) as details:
+        transport = transport_class()
+        protocol = Http1Protocol(transport)
+
+        if transport_class is TcpTransport:
+            protocol.connect(details.host, details.port)
+        else:
+            protocol.connect(details.path, 0)
+
+        protocol.send_requests([
+            HttpRequest(method=HttpMethod.POST, path="/a", body=b"hello", headers=[("Content-Length", "5")]),
+            HttpRequest(method=HttpMethod.POST, path="/b", body=b"world", headers=[("Content-Length", "5")]),
+        ])
+
+        assert protocol.read_response_safe().body == b"ok"
+        assert protocol.read_response_safe().body == b"ok"
+
+        expected_batch = (
+            b"POST /a HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello"
+            b"POST /b HTTP/1.1\r\nContent-Length: 5\r\n\r\nworld"
+        )
+        assert request_slot.get(timeout=1.0) == expected_batch
+
+        protocol.disconnect()
+
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_unsafe_response_is_valid_until_released(server_factory, transport_class):
+    def handler(client_sock: socket.socket):
+        for body in (b"first", b"other"):
+            client_sock.recv(1024)
+            client_sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n" + body)
+
+    with server_factory(transport_class, handler) as details:
+        transport = transport_class()
+        protocol = Http1Protocol(transport)
+
+        if transport_class is TcpTransport:
+            protocol.connect(details.host, details.port)
+        else:
+            protocol.connect(details.path, 0)
+
+        first = protocol.perform_request_unsafe(HttpRequest())
+        second = protocol.perform_request_unsafe(HttpRequest())
+
+        assert first.body.tobytes() == b"first"
+        assert second.body.tobytes() == b"other"
+
+        first.release()
+        with pytest.raises(ValueError):
+            first.body.tobytes()
+        assert second.body.tobytes() == b"other"
+
+        second.release()
+        protocol.disconnect()
+
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_holds_two_unsafe_responses_at_once(server_factory, transport_class):
+    # Both responses arrive in one segment, so the second is carried over in
+    # the buffer the first still views.
+    canned_responses = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\nX-Name: one\r\n\r\nfirst"
+        b"HTTP/1.1 201 Created\r\nContent-Length: 6\r\nX-Name: two\r\n\r\nsecond"
+    )
+
+    def handler(client_sock: socket.socket):
+        received = b""
+        while received.count(b"\r\n\r\n") < 2:
+            received += client_sock.recv(1024)
+        client_sock.sendall(canned_responses)
+
+    with server_factory(transport_class, handler) as details:
+        transport = transport_class()
+        protocol = Http1Protocol(transport)
+
+        if transport_class is TcpTransport:
+            protocol.connect(details.host, details.port)
+        else:
+            protocol.connect(details.path, 0)
+
+        protocol.send_requests([HttpRequest(path="/first"), HttpRequest(path="/second")])
+
+        first = protocol.read_response_unsafe()
+        second = protocol.read_response_unsafe()
+
+        assert first.status_code == 200
+        assert first.body.tobytes() == b"first"
+        assert first.headers[1][1].tobytes() == b"one"
+        assert second.status_code == 201
+        assert second.body.tobytes() == b"second"
+        assert second.headers[1][1].tobytes() == b"two"
+
+        protocol.disconnect()
+
+
+@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
+def test_parses_content_length_case_insensitively(server_factory, pooled_protocol, transport_class):
+    canned_response = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"content-length: 5\r\n"
+        b"\r\n"
+        b"Hello"
+    )
+
+    def handler(client_sock: socket.socket):
+        client_sock.recv(1024)
+        client_sock.sendall(canned_response)
+
+    with server_factory(transport_class, handler, keep_alive=True):
+        protocol = pooled_protocol
+
+        res = protocol.perform_request_safe(HttpRequest())
+
+        assert res.content_length == 5
+        assert res.body == b"Hello"
@@ -1,102 +1,27 @@
 import pytest
 import socket
-import threading
-import time
-import os
 import random
-import functools
-import operator
-import socketserver
+import binascii
 
 
-from dataclasses import dataclass
-from typing import Callable, Generator, Type
-from contextlib import contextmanager
-from queue import Queue
+import numpy as np
 
 
 from httppy.httppy import HttpClient
 from httppy.http1_protocol import Http1Protocol
 from httppy.tcp_transport import TcpTransport
 from httppy.unix_transport import UnixTransport
-from httppy.transport import Transport
 from httppy.errors import InvalidRequestError
 from httppy.http_protocol import HttpRequest, HttpMethod, SafeHttpResponse, UnsafeHttpResponse
 
 
-@dataclass
-class ServerDetails:
-    host: str = ""
-    port: int = 0
-    path: str = ""
-
-
-@pytest.fixture
-def server_factory() -> Callable[[Type[Transport], Callable[[socket.socket], None]], Generator[ServerDetails, None, None]]:
-    @contextmanager
-    def _factory(transport_class: Type[Transport], handler: Callable[[socket.socket], None]):
-        server_thread = None
-        listener_sock = None
-        details = ServerDetails()
-        stop_event = threading.Event()
-
-        def server_loop(listener: socket.socket):
-            try:
-                client_sock, _ = listener.accept()
-                with client_sock:
-                    handler(client_sock)
-            except (socket.timeout, OSError):
-                pass
-
-        if transport_class is TcpTransport:
-            listener_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            listener_sock.bind(("127.0.0.1", 0))
-            details.host, details.port = listener_sock.getsockname()
-        elif transport_class is UnixTransport:
-            details.path = f"/tmp/httppy_client_test_{os.getpid()}_{time.time_ns()}.sock"
-            if os.path.exists(details.path):
-                os.remove(details.path)
-            listener_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            listener_sock.bind(details.path)
-        else:
-            pytest.fail(f"Unknown transport type for server_factory: {transport_class}")
-
-        try:
-            listener_sock.settimeout(1.0)
-            listener_sock.listen()
-            server_thread = threading.Thread(target=server_loop, args=(listener_sock,))
-            server_thread.start()
-            yield details
-        finally:
-            stop_event.set()
-            if transport_class is TcpTransport:
-                with socket.create_connection((details.host, details.port), timeout=0.1):
-                    pass
-            elif transport_class is UnixTransport:
-                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
-                    try:
-                        sock.connect(details.path)
-                    except (ConnectionRefusedError, FileNotFoundError):
-                        pass
-
-            if server_thread:
-                server_thread.join(timeout=1.0)
-            if listener_sock:
-                listener_sock.close()
-            if transport_class is UnixTransport and os.path.exists(details.path):
-                os.remove(details.path)
-
-    return _factory
-
-
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_get_request_safe_succeeds(server_factory, transport_class):
+def test_get_request_safe_succeeds(server_factory, transport_class, request_slot):
     canned_response = b"HTTP/1.1 200 OK\r\nContent-Length: 7\r\n\r\nsuccess"
-    request_queue = Queue()
 
     def handler(client_sock: socket.socket):
         data = client_sock.recv(1024)
-        request_queue.put(data)
+        request_slot.put(data)
         client_sock.sendall(canned_response)
 
     with server_factory(transport_class, handler) as details:
@@ -116,20 +41,19 @@ def test_get_request_safe_succeeds(server_factory, transport_class):
         assert res.status_code == 200
         assert res.body == b"success"
 
-        captured_request = request_queue.get(timeout=1.0)
+        captured_request = request_slot.get(timeout=1.0)
         assert b"GET /test HTTP/1.1" in captured_request
 
         client.disconnect()
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_get_request_unsafe_succeeds(server_factory, transport_class):
+def test_get_request_unsafe_succeeds(server_factory, transport_class, request_slot):
     canned_response = b"HTTP/1.1 200 OK\r\nContent-Length: 7\r\n\r\nsuccess"
-    request_queue = Queue()
 
     def handler(client_sock: socket.socket):
         data = client_sock.recv(1024)
-        request_queue.put(data)
+        request_slot.put(data)
         client_sock.sendall(canned_response)
 
     with server_factory(transport_class, handler) as details:
@@ -150,20 +74,19 @@ def test_get_request_unsafe_succeeds(server_factory, transport_class):
         assert isinstance(res.body, memoryview)
         assert res.body.tobytes() == b"success"
 
-        captured_request = request_queue.get(timeout=1.0)
+        captured_request = request_slot.get(timeout=1.0)
         assert b"GET /test HTTP/1.1" in captured_request
 
         client.disconnect()
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_post_request_safe_succeeds(server_factory, transport_class):
+def test_post_request_safe_succeeds(server_factory, transport_class, request_slot):
     canned_response = b"HTTP/1.1 200 OK\r\nContent-Length: 7\r\n\r\nsuccess"
-    request_queue = Queue()
 
     def handler(client_sock: socket.socket):
         data = client_sock.recv(1024)
-        request_queue.put(data)
+        request_slot.put(data)
         client_sock.sendall(canned_response)
 
     with server_factory(transport_class, handler) as details:
@@ -188,7 +111,7 @@ def test_post_request_safe_succeeds(server_factory, transport_class):
         assert res.status_code == 200
         assert res.body == b"success"
 
-        captured_request = request_queue.get(timeout=1.0)
+        captured_request = request_slot.get(timeout=1.0)
         assert b"POST /submit HTTP/1.1" in captured_request
         assert captured_request.endswith(body_content)
 
@@ -196,13 +119,12 @@ def test_post_request_safe_succeeds(server_factory, transport_class):
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_post_request_unsafe_succeeds(server_factory, transport_class):
+def test_post_request_unsafe_succeeds(server_factory, transport_class, request_slot):
     canned_response = b"HTTP/1.1 200 OK\r\nContent-Length: 7\r\n\r\nsuccess"
-    request_queue = Queue()
 
     def handler(client_sock: socket.socket):
         data = client_sock.recv(1024)
-        request_queue.put(data)
+        request_slot.put(data)
         client_sock.sendall(canned_response)
 
     with server_factory(transport_class, handler) as details:
@@ -228,7 +150,7 @@ def test_post_request_unsafe_succeeds(server_factory, transport_class):
         assert isinstance(res.body, memoryview)
         assert res.body.tobytes() == b"success"
 
-        captured_request = request_queue.get(timeout=1.0)
+        captured_request = request_slot.get(timeout=1.0)
         assert b"POST /submit HTTP/1.1" in captured_request
         assert captured_request.endswith(body_content)
 
@@ -236,10 +158,44 @@ def test_post_request_unsafe_succeeds(server_factory, transport_class):
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_get_request_with_body_returns_error(transport_class):
-    transport = transport_class()
-    protocol = Http1Protocol(transport)
-    client = HttpClient(protocol)
+def test_pipelined_requests_return_responses_in_order(server_factory, transport_class):
+    canned_responses = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\none"
+        b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\ntwo"
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nthree"
+    )
+
+    def handler(client_sock: socket.socket):
+        received = b""
+        while received.count(b"\r\n\r\n") < 3:
+            received += client_sock.recv(1024)
+        client_sock.sendall(canned_responses)
+
+    with server_factory(transport_class, handler) as details:
+        client = HttpClient(Http1Protocol(transport_class()))
+
+        if transport_class is TcpTransport:
+            client.connect(details.host, details.port)
+        else:
+            client.connect(details.path, 0)
+
+        requests = [HttpRequest(path=f"/{i}") for i in range(3)]
+        responses = client.perform_pipelined(requests)
+
+        assert [res.body for res in responses] == [b"one", b"two", b"three"]
+        assert all(isinstance(res, SafeHttpResponse) for res in responses)
+
+        client.disconnect()
+
+
+# Request validation rejects these before anything reaches the transport,
+# so a single unconnected transport covers both kinds.
+def _make_client() -> HttpClient:
+    return HttpClient(Http1Protocol(TcpTransport()))
+
+
+def test_get_request_with_body_returns_error():
+    client = _make_client()
 
     request = HttpRequest(
         path="/test",
@@ -253,11 +209,8 @@ def test_get_request_with_body_returns_error(transport_class):
         client.get_unsafe(request)
 
 
-@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_post_request_without_body_returns_error(transport_class):
-    transport = transport_class()
-    protocol = Http1Protocol(transport)
-    client = HttpClient(protocol)
+def test_post_request_without_body_returns_error():
+    client = _make_client()
 
     request = HttpRequest(
         path="/test",
@@ -272,11 +225,8 @@ def test_post_request_without_body_returns_error(transport_class):
         client.post_unsafe(request)
 
 
-@pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
-def test_post_request_without_content_length_returns_error(transport_class):
-    transport = transport_class()
-    protocol = Http1Protocol(transport)
-    client = HttpClient(protocol)
+def test_post_request_without_content_length_returns_error():
+    client = _make_client()
 
     request = HttpRequest(
         path="/test",
@@ -291,111 +241,78 @@ def test_post_request_without_content_length_returns_error(transport_class):
         client.post_unsafe(request)
 
 
-def xor_checksum(data: bytes) -> int:
-    return functools.reduce(operator.xor, data, 0)
-
-
-@pytest.fixture
-def server_factory() -> Callable[[Type[Transport], Callable[[socket.socket], None]], Generator[ServerDetails, None, None]]:
-    @contextmanager
-    def _factory(transport_class: Type[Transport], handler: Callable[[socket.socket], None]):
-        server_thread = None
-        listener_sock = None
-        details = ServerDetails()
-        stop_event = threading.Event()
-
-        def server_loop(listener: socket.socket):
-            try:
-                client_sock, _ = listener.accept()
-                with client_sock:
-                    while not stop_event.is_set():
-                        if not handler(client_sock):
-                            break
-            except (socket.timeout, OSError):
-                pass
-
-        if transport_class is TcpTransport:
-            listener_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            listener_sock.bind(("127.0.0.1", 0))
-            details.host, details.port = listener_sock.getsockname()
-        elif transport_class is UnixTransport:
-            details.path = f"/tmp/httppy_client_test_{os.getpid()}_{time.time_ns()}.sock"
-            if os.path.exists(details.path):
-                os.remove(details.path)
-            listener_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            listener_sock.bind(details.path)
-
-        try:
-            listener_sock.settimeout(2.0)
-            listener_sock.listen()
-            server_thread = threading.Thread(target=server_loop, args=(listener_sock,))
-            server_thread.start()
-            yield details
-        finally:
-            stop_event.set()
-            if transport_class is TcpTransport:
-                with socket.create_connection((details.host, details.port), timeout=0.1): pass
-            elif transport_class is UnixTransport:
-                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
-                    try: sock.connect(details.path)
-                    except (ConnectionRefusedError, FileNotFoundError): pass
-
-            if server_thread: server_thread.join(timeout=2.0)
-            if listener_sock: listener_sock.close()
-            if transport_class is UnixTransport and os.path.exists(details.path):
-                os.remove(details.path)
-
-    return _factory
+def xor_checksum(data: bytes | bytearray | memoryview) -> int:
+    return int(np.bitwise_xor.reduce(np.frombuffer(data, dtype=np.uint8)))
 
 
 @pytest.mark.parametrize("transport_class", [TcpTransport, UnixTransport])
 def test_multi_request_checksum_verification(server_factory, transport_class):
     NUM_CYCLES = 50
+    PAYLOAD_POOL_SIZE = 65536
     server_rng = random.Random(4321)
+    # Generate random bytes once and serve each payload as a window into them.
+    server_pool = memoryview(server_rng.randbytes(PAYLOAD_POOL_SIZE))
 
-    def handler(client_sock: socket.socket) -> bool:
-        try:
-            headers_raw = bytearray()
-            while b'\r\n\r\n' not in headers_raw:
-                chunk = client_sock.recv(1024)
-                if not chunk: return False
-                headers_raw.extend(chunk)
+    # Requests are served one at a time, so a single receive buffer is reused
+    # for all of them and read into directly.
+    recv_buffer = bytearray(8192)
+    recv_view = memoryview(recv_buffer)
 
-            header_text, body_raw = headers_raw.split(b'\r\n\r\n', 1)
+    def handler(client_sock: socket.socket):
+        try:
+            filled = 0
+            header_end = -1
+            while header_end == -1:
+                bytes_read = client_sock.recv_into(recv_view[filled:])
+                if not bytes_read: return
+                header_end = recv_buffer.find(b'\r\n\r\n', max(0, filled - 3), filled + bytes_read)
+                filled += bytes_read
+
+            # The request line comes first, so every header follows a CRLF and
+            # one find over the lowered block locates Content-Length.
+            header_lower = recv_buffer[:header_end].lower()
             content_length = 0
-            for line in header_text.split(b'\r\n'):
-                if line.lower().startswith(b'content-length:'):
-                    content_length = int(line.split(b':')[1].strip())
-                    break
-
-            while len(body_raw) < content_length:
-                chunk = client_sock.recv(content_length - len(body_raw))
-                if not chunk: return False
-                body_raw.extend(chunk)
-
-            payload = body_raw[:-16]
-            checksum_hex = body_raw[-16:].decode('ascii')
+            cl_pos = header_lower.find(b'\r\ncontent-length:')
+            if cl_pos != -1:
+                value_start = cl_pos + len(b'\r\ncontent-length:')
+                value_end = header_lower.find(b'\r\n', value_start)
+                if value_end == -1: value_end = header_end
+                content_length = int(header_lower[value_start:value_end])
+
+            body_end = header_end + 4 + content_length
+            while filled < body_end:
+                bytes_read = client_sock.recv_into(recv_view[filled:body_end])
+                if not bytes_read: return
+                filled += bytes_read
+
+            payload = recv_view[header_end + 4:body_end - 16]
+            checksum_hex = recv_view[body_end - 16:body_end]
             calculated = xor_checksum(payload)
-            received = int(checksum_hex, 16)
+            received = int.from_bytes(binascii.unhexlify(checksum_hex), 'big')
             if calculated != received:
                 error_response = b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n"
                 client_sock.sendall(error_response)
-                return False
+                return
 
             # 3. Send server response
             res_body_len = server_rng.randint(512, 1024)
-            res_payload = server_rng.randbytes(res_body_len)
+            res_offset = server_rng.randrange(PAYLOAD_POOL_SIZE - res_body_len)
+            res_payload = server_pool[res_offset:res_offset + res_body_len]
             res_checksum = xor_checksum(res_payload)
-            res_checksum_hex = f'{res_checksum:016x}'.encode('ascii')
-            full_response_body = res_payload + res_checksum_hex
-
-            response = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(full_response_body)
-            client_sock.sendall(response + full_response_body)
-            return True
+            res_checksum_hex = b'%016x' % res_checksum
+            length_bytes = b"%d" % (res_body_len + len(res_checksum_hex))
+
+            # Assemble the head and body in one join so each reply is a single allocation.
+            client_sock.sendall(b"".join((
+                b"HTTP/1.1 200 OK\r\nContent-Length: ", length_bytes, b"\r\n\r\n",
+                res_payload, res_checksum_hex,
+            )))
         except (ConnectionError, UnicodeDecodeError, ValueError):
-            return False
+            pass
 
-    with server_factory(transport_class, handler) as details:
+    # The client sends every request over one connection, so keep it open
+    # between them.
+    with server_factory(transport_class, handler, keep_alive=True) as details:
         client = HttpClient(Http1Protocol(transport_class()))
 
         if transport_class is TcpTransport:
@@ -404,25 +321,32 @@ def test_multi_request_checksum_verification(server_factory, transport_class):
             client.connect(details.path, 0)
 
         client_rng = random.Random(1234)
+        client_pool = memoryview(client_rng.randbytes(PAYLOAD_POOL_SIZE))
+        # Bodies are 512-1024 payload bytes plus 16 checksum digits, so every
+        # Content-Length header the loop can need is built once here.
+        content_length_headers = {length: ("Content-Length", str(length)) for length in range(512 + 16, 1024 + 16 + 1)}
 
         def run_client_loop(use_safe: bool):
             for i in range(NUM_CYCLES):
-                req_payload = client_rng.randbytes(client_rng.randint(512, 1024))
-                req_checksum = f'{xor_checksum(req_payload):016x}'.encode('ascii')
-                full_body = req_payload + req_checksum
+                req_body_len = client_rng.randint(512, 1024)
+                req_offset = client_rng.randrange(PAYLOAD_POOL_SIZE - req_body_len)
+                req_payload = client_pool[req_offset:req_offset + req_body_len]
+                req_checksum = b'%016x' % xor_checksum(req_payload)
+                full_body = b"".join((req_payload, req_checksum))
 
-                request = HttpRequest(path="/", body=full_body, headers=[("Content-Length", str(len(full_body)))])
+                request = HttpRequest(path="/", body=full_body, headers=[content_length_headers[len(full_body)]])
                 res = client.post_safe(request) if use_safe else client.post_unsafe(request)
 
                 assert res.status_code == 200
 
-                res_body = res.body if use_safe else res.body.tobytes()
+                # View the body either way; the checksum digits are decoded in place.
+                res_body = memoryview(res.body)
                 assert len(res_body) >= 16
 
-                res_payload_bytes = res_body[:-16]
-                res_checksum_hex = res_body[-16:].decode('ascii')
+                res_payload = res_body[:-16]
+                res_checksum_hex = res_body[-16:]
 
-                assert xor_checksum(res_payload_bytes) == int(res_checksum_hex, 16)
+                assert xor_checksum(res_payload) == int.from_bytes(binascii.unhexlify(res_checksum_hex), 'big')
 
         try:
             run_client_loop(use_safe=True)
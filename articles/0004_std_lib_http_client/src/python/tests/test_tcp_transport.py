@@ -1,8 +1,6 @@
 import pytest
 import socket
-import threading
 import time
-from queue import Queue
 
 
 from unittest.mock import patch
@@ -17,46 +15,10 @@ from httppy.errors import (
     SocketReadError
 )
 
-class ServerFixture:
-    def __init__(self, handler):
-        self._handler = handler
-        self._should_stop = threading.Event()
-        self.listener_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.listener_sock.bind(("127.0.0.1", 0))
-        self.port = self.listener_sock.getsockname()[1]
-        self.thread = threading.Thread(target=self._accept_loop)
-
-    def start(self):
-        self.thread.start()
-
-    def stop(self):
-        if not self._should_stop.is_set():
-            self._should_stop.set()
-            # Connect to unblock the accept() call
-            try:
-                socket.create_connection(("127.0.0.1", self.port), timeout=0.1)
-            except OSError:
-                pass
-            self.thread.join()
-            self.listener_sock.close()
-
-    def _accept_loop(self):
-        self.listener_sock.listen()
-        try:
-            client_sock, _ = self.listener_sock.accept()
-            with client_sock:
-                if self._handler:
-                    self._handler(client_sock)
-        except OSError:
-            pass
-
 
 @pytest.fixture
-def test_server(request):
-    server = ServerFixture(request.param if hasattr(request, "param") else None)
-    server.start()
-    yield server
-    server.stop()
+def transport_class():
+    return TcpTransport
 
 
 def test_construction_succeeds():
@@ -70,34 +32,84 @@ def test_construction_succeeds():
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_connect_succeeds(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
     transport.close()
 
 
-def test_write_succeeds(test_server):
-    message_queue = Queue()
+def test_write_succeeds(test_server, request_slot):
     def server_logic(sock):
         data = sock.recv(1024)
-        message_queue.put(data)
+        request_slot.put(data)
 
-    test_server._handler = server_logic
+    test_server.serve_next(server_logic)
 
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
     message_to_send = b"hello from client"
     bytes_written = transport.write(message_to_send)
 
     assert bytes_written == len(message_to_send)
 
-    captured_message = message_queue.get(timeout=1)
+    captured_message = request_slot.get(timeout=1)
     assert captured_message == message_to_send
     transport.close()
 
 
+def test_writev_sends_all_buffers_in_order(test_server, request_slot):
+    # A multi-megabyte buffer between small ones, plus an empty one
+    buffers = [b"head", bytes(range(256)) * 16384, b"", b"tail"]
+    expected = b"".join(buffers)
+    def server_logic(sock):
+        received = bytearray()
+        while len(received) < len(expected):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+        request_slot.put(bytes(received))
+    test_server.serve_next(server_logic)
+
+    transport = TcpTransport()
+    transport.connect("127.0.0.1", test_server.details.port)
+    bytes_written = transport.writev(buffers)
+
+    assert bytes_written == len(expected)
+    captured_message = request_slot.get(timeout=1)
+    assert captured_message == expected
+    transport.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "TCP_CORK"), reason="TCP_CORK is Linux only")
+@pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
+def test_writev_resends_the_rest_after_short_writes(test_server):
+    transport = TcpTransport()
+    transport.connect("127.0.0.1", test_server.details.port)
+    sent_batches = []
+    corked = []
+    sent_counts = [6, 3, 3]
+
+    # Real blocking sends never come up short here, so the kernel's answer
+    # is faked: record what each call was asked to send and take a little.
+    def short_sendmsg(sock, buffers):
+        sent_batches.append([bytes(buffer) for buffer in buffers])
+        corked.append(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_CORK))
+        return sent_counts.pop(0)
+
+    with patch.object(socket.socket, "sendmsg", short_sendmsg):
+        bytes_written = transport.writev([b"head", b"body", b"tail"])
+
+    assert bytes_written == 12
+    assert sent_batches == [[b"head", b"body", b"tail"], [b"dy", b"tail"], [b"ail"]]
+    # Corked after the first short write and uncorked once everything is queued.
+    assert corked == [0, 1, 1]
+    assert transport._sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_CORK) == 0
+    transport.close()
+
+
 @pytest.mark.parametrize("test_server", [lambda sock: sock.sendall(b"hello from server")], indirect=True)
 def test_read_into_succeeds(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
 
     buffer = bytearray(1024)
     bytes_read = transport.read_into(buffer)
@@ -107,17 +119,35 @@ def test_read_into_succeeds(test_server):
     transport.close()
 
 
+def _send_in_two_parts(sock):
+    sock.sendall(b"hello ")
+    sock.sendall(b"from server")
+
+
+@pytest.mark.parametrize("test_server", [_send_in_two_parts], indirect=True)
+def test_read_exact_fills_whole_buffer(test_server):
+    transport = TcpTransport()
+    transport.connect("127.0.0.1", test_server.details.port)
+
+    buffer = bytearray(len(b"hello from server"))
+    bytes_read = transport.read_exact(memoryview(buffer))
+
+    assert bytes_read == len(buffer)
+    assert buffer == b"hello from server"
+    transport.close()
+
+
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_close_succeeds(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
     transport.close()
 
 
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_close_is_idempotent(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
     transport.close()
     transport.close()
 
@@ -133,38 +163,35 @@ def test_connect_fails_on_dns_failure():
     with pytest.raises(DnsFailureError):
         transport.connect("a-hostname-that-will-not-resolve.invalid", 80)
 
-def test_write_fails_on_closed_connection():
-    server_closed_event = threading.Event()
-    def server_logic(sock):
-        # Force an abrupt RST shutdown with SO_LINGER
-        import struct
-        l_onoff = 1
-        l_linger = 0
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', l_onoff, l_linger))
-        server_closed_event.set()
+def _reset_on_close(sock):
+    # Force an abrupt RST shutdown with SO_LINGER
+    import struct
+    l_onoff = 1
+    l_linger = 0
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', l_onoff, l_linger))
 
-    server = ServerFixture(server_logic)
-    server.start()
 
+@pytest.mark.parametrize("test_server", [_reset_on_close], indirect=True)
+def test_write_fails_on_closed_connection(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
 
-    server_closed_event.wait(timeout=1)
+    # The accept loop marks the connection served only after closing it
+    test_server.wait_until_served(timeout=1)
     time.sleep(0.05) # Give OS time to process RST
 
     with pytest.raises(SocketWriteError):
         transport.write(b"this should fail")
-
-    server.stop()
+    transport.close()
 
 
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_read_into_fails_on_peer_shutdown(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
 
     # Wait for the server thread to accept and close the connection
-    test_server.thread.join(timeout=1)
+    test_server.wait_until_served(timeout=1)
 
     buffer = bytearray(1024)
     bytes_read = transport.read_into(buffer)
@@ -188,10 +215,10 @@ def test_read_into_fails_if_not_connected():
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_connect_fails_if_already_connected(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
 
     with pytest.raises(TransportError, match="Transport is already connected."):
-        transport.connect("127.0.0.1", test_server.port)
+        transport.connect("127.0.0.1", test_server.details.port)
 
     transport.close()
 
@@ -199,7 +226,7 @@ def test_connect_fails_if_already_connected(test_server):
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_read_into_raises_socket_read_error_on_os_error(test_server):
     transport = TcpTransport()
-    transport.connect("127.0.0.1", test_server.port)
+    transport.connect("127.0.0.1", test_server.details.port)
 
     buffer = bytearray(1024)
 
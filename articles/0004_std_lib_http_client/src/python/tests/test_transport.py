@@ -0,0 +1,83 @@
+import socket
+
+import pytest
+
+from httppy.transport import Transport, sendmsg_all
+
+
+# Implements only the methods every transport had before writev and
+# read_exact, so the rest come from the Transport fallbacks.
+class MinimalTransport(Transport):
+    def __init__(self, incoming: list[bytes]):
+        self.written = b""
+        self._incoming = incoming
+
+    def connect(self, host: str, port: int) -> None:
+        pass
+
+    def write(self, data: bytes) -> int:
+        self.written += data
+        return len(data)
+
+    def read_into(self, buffer: bytearray) -> int:
+        if not self._incoming:
+            return 0
+        chunk = self._incoming.pop(0)
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self) -> None:
+        pass
+
+
+def test_writev_falls_back_to_one_write():
+    transport = MinimalTransport([])
+
+    bytes_written = transport.writev([b"head", b"", memoryview(b"tail")])
+
+    assert bytes_written == 8
+    assert transport.written == b"headtail"
+
+
+def test_read_exact_falls_back_to_repeated_reads():
+    transport = MinimalTransport([b"he", b"llo", b" world"])
+    buffer = bytearray(5)
+
+    bytes_read = transport.read_exact(memoryview(buffer))
+
+    assert bytes_read == 5
+    assert buffer == b"hello"
+
+
+def test_read_exact_fallback_stops_when_peer_closes():
+    transport = MinimalTransport([b"abc"])
+    buffer = bytearray(8)
+
+    bytes_read = transport.read_exact(memoryview(buffer))
+
+    assert bytes_read == 3
+    assert buffer[:3] == b"abc"
+
+
+# Takes a fixed number of bytes per sendmsg() and then fails.
+class FailingSocket:
+    def __init__(self, sends: list[int]):
+        self.options: list[tuple[int, int, int]] = []
+        self._sends = sends
+
+    def sendmsg(self, buffers) -> int:
+        if not self._sends:
+            raise BrokenPipeError("peer went away")
+        return self._sends.pop(0)
+
+    def setsockopt(self, level: int, option: int, value: int) -> None:
+        self.options.append((level, option, value))
+
+
+def test_sendmsg_all_uncorks_when_a_send_fails():
+    sock = FailingSocket([3])
+
+    with pytest.raises(BrokenPipeError):
+        sendmsg_all(sock, [b"headers", b"body"], cork=3)
+
+    assert sock.options == [(socket.IPPROTO_TCP, 3, 1), (socket.IPPROTO_TCP, 3, 0)]
@@ -1,9 +1,6 @@
 import pytest
 import socket
-import threading
 import time
-import os
-from queue import Queue
 from unittest.mock import patch
 
 from httppy.unix_transport import UnixTransport
@@ -14,53 +11,10 @@ from httppy.errors import (
     SocketReadError
 )
 
-class UnixServerFixture:
-    def __init__(self, handler):
-        self._handler = handler
-        self._should_stop = threading.Event()
-
-        self.socket_path = f"/tmp/httppy_test_{os.getpid()}_{time.time_ns()}"
-        # Clean up any old socket file
-        if os.path.exists(self.socket_path):
-            os.remove(self.socket_path)
-
-        self.listener_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.listener_sock.settimeout(0.5) # To prevent hanging on accept
-        self.listener_sock.bind(self.socket_path)
-        self.thread = threading.Thread(target=self._accept_loop)
-
-    def start(self):
-        self.thread.start()
-
-    def stop(self):
-        if not self._should_stop.is_set():
-            self._should_stop.set()
-            self.thread.join()
-            self.listener_sock.close()
-            if os.path.exists(self.socket_path):
-                os.remove(self.socket_path)
-
-    def _accept_loop(self):
-        self.listener_sock.listen()
-        while not self._should_stop.is_set():
-            try:
-                client_sock, _ = self.listener_sock.accept()
-                with client_sock:
-                    if self._handler:
-                        self._handler(client_sock)
-                # Only handle one connection for simplicity in tests
-                break
-            except socket.timeout:
-                continue
-            except OSError:
-                break
 
 @pytest.fixture
-def test_server(request):
-    server = UnixServerFixture(request.param if hasattr(request, "param") else None)
-    server.start()
-    yield server
-    server.stop()
+def transport_class():
+    return UnixTransport
 
 
 def test_construction_succeeds():
@@ -73,30 +27,72 @@ def test_construction_succeeds():
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_connect_succeeds(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
     transport.close()
 
-def test_write_succeeds(test_server):
-    message_queue = Queue()
+def test_write_succeeds(test_server, request_slot):
     def server_logic(sock):
         data = sock.recv(1024)
-        message_queue.put(data)
-    test_server._handler = server_logic
+        request_slot.put(data)
+    test_server.serve_next(server_logic)
 
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
     message_to_send = b"hello from client"
     bytes_written = transport.write(message_to_send)
 
     assert bytes_written == len(message_to_send)
-    captured_message = message_queue.get(timeout=1)
+    captured_message = request_slot.get(timeout=1)
     assert captured_message == message_to_send
     transport.close()
 
+def test_writev_sends_all_buffers_in_order(test_server, request_slot):
+    # A multi-megabyte buffer between small ones, plus an empty one
+    buffers = [b"head", bytes(range(256)) * 16384, b"", b"tail"]
+    expected = b"".join(buffers)
+    def server_logic(sock):
+        received = bytearray()
+        while len(received) < len(expected):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+        request_slot.put(bytes(received))
+    test_server.serve_next(server_logic)
+
+    transport = UnixTransport()
+    transport.connect(test_server.details.path, 0)
+    bytes_written = transport.writev(buffers)
+
+    assert bytes_written == len(expected)
+    captured_message = request_slot.get(timeout=1)
+    assert captured_message == expected
+    transport.close()
+
+@pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
+def test_writev_resends_the_rest_after_short_writes(test_server):
+    transport = UnixTransport()
+    transport.connect(test_server.details.path, 0)
+    sent_batches = []
+    sent_counts = [6, 3, 3]
+
+    # Real blocking sends never come up short here, so the kernel's answer
+    # is faked: record what each call was asked to send and take a little.
+    def short_sendmsg(sock, buffers):
+        sent_batches.append([bytes(buffer) for buffer in buffers])
+        return sent_counts.pop(0)
+
+    with patch.object(socket.socket, "sendmsg", short_sendmsg):
+        bytes_written = transport.writev([b"head", b"body", b"tail"])
+
+    assert bytes_written == 12
+    assert sent_batches == [[b"head", b"body", b"tail"], [b"dy", b"tail"], [b"ail"]]
+    transport.close()
+
 @pytest.mark.parametrize("test_server", [lambda sock: sock.sendall(b"hello from server")], indirect=True)
 def test_read_into_succeeds(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
 
     buffer = bytearray(1024)
     bytes_read = transport.read_into(buffer)
@@ -105,16 +101,32 @@ def test_read_into_succeeds(test_server):
     assert buffer[:bytes_read] == b"hello from server"
     transport.close()
 
+def _send_in_two_parts(sock):
+    sock.sendall(b"hello ")
+    sock.sendall(b"from server")
+
+@pytest.mark.parametrize("test_server", [_send_in_two_parts], indirect=True)
+def test_read_exact_fills_whole_buffer(test_server):
+    transport = UnixTransport()
+    transport.connect(test_server.details.path, 0)
+
+    buffer = bytearray(len(b"hello from server"))
+    bytes_read = transport.read_exact(memoryview(buffer))
+
+    assert bytes_read == len(buffer)
+    assert buffer == b"hello from server"
+    transport.close()
+
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_close_succeeds(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
     transport.close()
 
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_close_is_idempotent(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
     transport.close()
     transport.close()
 
@@ -124,35 +136,31 @@ def test_connect_fails_on_unresponsive_path():
     with pytest.raises(SocketConnectError):
         transport.connect(path, 0)
 
-def test_write_fails_on_closed_connection():
-    server_closed_event = threading.Event()
-    def server_logic(sock):
-        import struct
-        l_onoff = 1
-        l_linger = 0
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', l_onoff, l_linger))
-        server_closed_event.set()
-
-    server = UnixServerFixture(server_logic)
-    server.start()
+def _reset_on_close(sock):
+    import struct
+    l_onoff = 1
+    l_linger = 0
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', l_onoff, l_linger))
 
+@pytest.mark.parametrize("test_server", [_reset_on_close], indirect=True)
+def test_write_fails_on_closed_connection(test_server):
     transport = UnixTransport()
-    transport.connect(server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
 
-    server_closed_event.wait(timeout=1)
+    # The accept loop marks the connection served only after closing it
+    test_server.wait_until_served(timeout=1)
     time.sleep(0.05)
 
     with pytest.raises(SocketWriteError):
         transport.write(b"this should fail")
-
-    server.stop()
+    transport.close()
 
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_read_into_fails_on_peer_shutdown(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
 
-    test_server.thread.join(timeout=1)
+    test_server.wait_until_served(timeout=1)
 
     buffer = bytearray(1024)
     bytes_read = transport.read_into(buffer)
@@ -173,17 +181,17 @@ def test_read_into_fails_if_not_connected():
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_connect_fails_if_already_connected(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
 
     with pytest.raises(TransportError, match="Transport is already connected."):
-        transport.connect(test_server.socket_path, 0)
+        transport.connect(test_server.details.path, 0)
 
     transport.close()
 
 @pytest.mark.parametrize("test_server", [lambda sock: None], indirect=True)
 def test_read_into_raises_socket_read_error_on_os_error(test_server):
     transport = UnixTransport()
-    transport.connect(test_server.socket_path, 0)
+    transport.connect(test_server.details.path, 0)
 
     buffer = bytearray(1024)
 